@@ -0,0 +1,290 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Import necessary classes from other tasks
+from Document_Processor import DocumentProcessor
+from Chroma_Collection_Creator import ChromaCollectionCreator
+from Resource_Registry import get_embedding_client, get_quiz_service
+from Embedding_Cache import get_embedding_cache
+from Question_Cache import get_question_cache
+
+logger = logging.getLogger("batch_quiz_generator")
+
+class BatchJob:
+    def __init__(self, pdfs, topic, num_questions=5, job_id=None):
+        """
+        Initializes one unit of batch work: a quiz on a topic from a set of PDFs.
+
+        :param pdfs: Paths of the PDFs the quiz is drawn from.
+        :param topic: The topic for the quiz.
+        :param num_questions: Number of questions for the quiz.
+        :param job_id: Optional stable ID. Defaults to a hash of the PDFs, topic and question count,
+                       so the same work keeps its ID across runs and is skipped once done.
+        """
+        self.pdfs = [os.path.abspath(pdf) for pdf in pdfs]
+        self.topic = topic
+        self.num_questions = num_questions
+        self.id = job_id or hashlib.sha256(
+            json.dumps([sorted(self.pdfs), topic, num_questions]).encode("utf-8")
+        ).hexdigest()[:16]
+
+    @property
+    def document_set(self) -> tuple:
+        return tuple(sorted(self.pdfs))
+
+def load_jobs(source, topics=(), num_questions=5) -> list:
+    """
+    Loads batch jobs from a directory of PDFs or a JSONL manifest.
+
+    A directory yields one job per PDF (searched recursively) and topic. Each manifest line is an
+    object with "topic" and either "pdf" or "pdfs", plus optional "num_questions" and "id"; relative
+    paths are resolved against the manifest's directory.
+
+    :param source: Path of the directory or manifest.
+    :param topics: Topics for directory sources.
+    :param num_questions: Default number of questions per quiz.
+    :return: A list of BatchJobs.
+    """
+    if os.path.isdir(source):
+        if not topics:
+            raise ValueError("A directory source needs at least one topic.")
+        pdfs = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(source) for name in names if name.lower().endswith(".pdf")
+        )
+        return [BatchJob([pdf], topic, num_questions) for pdf in pdfs for topic in topics]
+
+    jobs = []
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            pdfs = entry.get("pdfs") or [entry["pdf"]]
+            if not entry.get("topic") or not pdfs:
+                raise ValueError(f"Manifest line {line_number} needs a topic and at least one PDF.")
+            jobs.append(BatchJob(
+                [os.path.join(base, pdf) for pdf in pdfs],
+                entry["topic"],
+                entry.get("num_questions", num_questions),
+                entry.get("id")
+            ))
+    return jobs
+
+def load_completed(output_path) -> set:
+    """
+    Reads the IDs of jobs already completed in an output file, so a restarted batch skips them.
+    Failed jobs are retried, and a line cut short by a crash is ignored.
+
+    :param output_path: Path of the JSONL output.
+    :return: The set of completed job IDs.
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "done":
+                completed.add(record["id"])
+    return completed
+
+class BatchQuizGenerator:
+    def __init__(self, output_path, embed_config, persist_directory="chroma_persistence_directory",
+                 backend="chroma", workers=2, generator_options=None):
+        """
+        Initializes a headless batch run of the DocumentProcessor, ChromaCollectionCreator and QuizGenerator
+        pipeline. Results are appended to a JSONL file one job per line as each job finishes, so a crashed
+        run resumes where it stopped and indexed collections and cached questions are reused.
+
+        :param output_path: Path of the JSONL output.
+        :param embed_config: EmbeddingClient arguments, e.g. model_name, project and location.
+        :param persist_directory: Directory the collections are persisted to.
+        :param backend: Vector store backend, "chroma" or "numpy".
+        :param workers: Number of jobs processed at once.
+        :param generator_options: QuizGenerator options, e.g. max_workers or batch_size.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.output_path = output_path
+        self.embed_config = embed_config
+        self.persist_directory = persist_directory
+        self.backend = backend
+        self.workers = workers
+        self.generator_options = generator_options or {}
+        self._output_lock = threading.Lock()
+        self._index_locks = {}  # Document set -> lock, so each set is indexed by one job at a time
+        self._locks_lock = threading.Lock()
+        self._progress_lock = threading.Lock()
+        self.stats = {}     # Counts of the current run
+        self.total = 0      # Jobs to run in the current run
+        self.started = None
+
+    def run(self, jobs) -> dict:
+        """
+        Runs the jobs not yet completed in the output file, reporting progress and throughput.
+
+        :param jobs: A list of BatchJobs.
+        :return: A dictionary with the number of jobs done, failed and skipped, questions generated and seconds taken.
+        """
+        completed = load_completed(self.output_path)
+        pending = [job for job in jobs if job.id not in completed]
+        self.stats = {"done": 0, "failed": 0, "skipped": len(jobs) - len(pending), "questions": 0}
+        self.total = len(pending)
+        self.started = time.monotonic()
+        print(f"{len(jobs)} jobs: {self.stats['skipped']} already done, {self.total} to run on {self.workers} workers.")
+
+        self._repair_output()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(self.process, job) for job in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                self.write(record)
+                self.report(record)
+
+        self.stats["seconds"] = time.monotonic() - self.started
+        return self.stats
+
+    def process(self, job) -> dict:
+        """
+        Indexes a job's PDFs and generates its quiz. Errors are recorded instead of raised, so one broken
+        PDF does not stop the batch.
+
+        :param job: The BatchJob.
+        :return: The output record of the job.
+        """
+        record = {"id": job.id, "topic": job.topic, "pdfs": job.pdfs, "num_questions": job.num_questions}
+        started = time.monotonic()
+        try:
+            processor = DocumentProcessor(max_workers=1)
+            embed_client = get_embedding_client(**self.embed_config)  # Shared across jobs
+            chroma_creator = ChromaCollectionCreator(
+                processor, embed_client, persist_directory=self.persist_directory, backend=self.backend,
+                notify=lambda level, message: logger.log(
+                    logging.WARNING if level == "error" else logging.INFO, "%s: %s", job.id, message
+                )  # Logged instead of shown through Streamlit, which the batch does not need
+            )
+
+            # Stream pages from disk; chunks already in the collection are skipped, so reruns are cheap
+            with self.index_lock(job.document_set):
+                pages = processor.iter_pages([(os.path.basename(pdf), pdf) for pdf in job.pdfs])
+                chroma_creator.create_chroma_collection(pages=pages)
+            if not chroma_creator.db.get(limit=1, include=[])["ids"]:
+                raise RuntimeError("No text could be extracted from the PDFs.")
+
+            questions, _ = get_quiz_service().generate_quiz(
+                job.topic, job.num_questions, chroma_creator, **self.generator_options
+            )
+            record["questions"] = questions
+            record["status"] = "done" if len(questions) == job.num_questions else "failed"
+            if record["status"] == "failed":
+                record["error"] = f"Generated {len(questions)} of {job.num_questions} questions."
+        except Exception as e:
+            record["status"] = "failed"
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["seconds"] = round(time.monotonic() - started, 3)
+        return record
+
+    def index_lock(self, document_set):
+        with self._locks_lock:
+            return self._index_locks.setdefault(document_set, threading.Lock())
+
+    def _repair_output(self):
+        # A crash can leave a partial last line; start appending on a fresh line
+        if os.path.exists(self.output_path) and os.path.getsize(self.output_path):
+            with open(self.output_path, "rb+") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def write(self, record):
+        """
+        Appends a job record to the output file and flushes it to disk.
+
+        :param record: The output record.
+        """
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._output_lock:
+            with open(self.output_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())  # A finished job survives a crash of the run
+
+    def report(self, record):
+        """
+        Prints a progress line with throughput and the estimated time remaining.
+
+        :param record: The output record of the job that just finished.
+        """
+        with self._progress_lock:
+            self.stats[record["status"]] += 1
+            self.stats["questions"] += len(record.get("questions", []))
+            finished = self.stats["done"] + self.stats["failed"]
+            elapsed = time.monotonic() - self.started
+            rate = finished / elapsed if elapsed else 0.0
+            remaining = (self.total - finished) / rate if rate else 0.0
+            print(
+                f"[{finished}/{self.total}] {record['status']} {record['topic']!r} in {record['seconds']:.1f}s"
+                f"{' (' + record['error'] + ')' if record.get('error') else ''} | "
+                f"{rate * 60:.1f} jobs/min, {self.stats['questions'] / elapsed if elapsed else 0.0:.2f} questions/s, "
+                f"ETA {remaining:.0f}s"
+            )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate quizzes for a directory or manifest of PDFs without the UI.")
+    parser.add_argument("source", help="Directory of PDFs, or a JSONL manifest of {\"pdfs\", \"topic\", \"num_questions\"} objects.")
+    parser.add_argument("output", help="JSONL file the quizzes are appended to; completed jobs in it are skipped.")
+    parser.add_argument("--topic", action="append", default=[], help="Quiz topic for directory sources; repeatable.")
+    parser.add_argument("--num-questions", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=2, help="Number of jobs processed at once.")
+    parser.add_argument("--question-workers", type=int, default=4, help="Question requests in flight per job.")
+    parser.add_argument("--batch-size", type=int, default=1, help="Questions requested per LLM call.")
+    parser.add_argument("--persist-directory", default="chroma_persistence_directory")
+    parser.add_argument("--backend", choices=["chroma", "numpy"], default="chroma")
+    parser.add_argument("--embedding-model", default="textembedding-gecko@003")
+    parser.add_argument("--project", default="gemini-quizzify-433204")
+    parser.add_argument("--location", default="us-central1")
+    parser.add_argument("--verbose", action="store_true", help="Log indexing status for every job.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(levelname)s %(message)s")
+
+    try:
+        jobs = load_jobs(args.source, args.topic, args.num_questions)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(str(e))
+
+    embed_config = {
+        "model_name": args.embedding_model,
+        "project": args.project,
+        "location": args.location,
+        # The caches live with the collections they were built for
+        "cache": get_embedding_cache(os.path.join(args.persist_directory, "embedding_cache.sqlite"))
+    }
+    batch = BatchQuizGenerator(
+        args.output,
+        embed_config,
+        persist_directory=args.persist_directory,
+        backend=args.backend,
+        workers=args.workers,
+        generator_options={
+            "max_workers": args.question_workers,
+            "batch_size": args.batch_size,
+            "question_cache": get_question_cache(os.path.join(args.persist_directory, "question_cache.sqlite"))
+        }
+    )
+    stats = batch.run(jobs)
+    print(
+        f"Finished in {stats['seconds']:.1f}s: {stats['done']} done, {stats['failed']} failed, "
+        f"{stats['skipped']} skipped, {stats['questions']} questions."
+    )
+    raise SystemExit(1 if stats["failed"] else 0)
@@ -1,101 +1,270 @@
-import sys
 import os
-import streamlit as st
+import hashlib
 
-# Adjust the path to include the root directory of your project
-sys.path.append(os.path.abspath('../../'))
+from Lazy_Import import lazy_import
 
 # Import necessary classes from other tasks
-from Document_Processor import DocumentProcessor
-from Embedding_Client import EmbeddingClient
+from Ingestion_Pipeline import IngestionPipeline
+from Text_Chunker import get_chunker
+from Context_Planner import clear_plan_cache
+from Keyword_Index import reciprocal_rank_fusion
+from Resource_Registry import get_vector_store, get_keyword_index
 
-# Import Task libraries
-from langchain_core.documents import Document
-from langchain.text_splitter import CharacterTextSplitter
-from langchain_community.vectorstores import Chroma
+# Heavy dependencies load on first use
+st = lazy_import("streamlit")
+lc_documents = lazy_import("langchain_core.documents")
+
+def streamlit_notify(level, message):
+    """
+    Shows a status update as a Streamlit success or error message.
+
+    :param level: "success" or "error".
+    :param message: The message text.
+    """
+    if level == "error":
+        st.error(message, icon="🚨")
+    else:
+        st.success(message, icon="✅")
 
 class ChromaCollectionCreator:
-    def __init__(self, processor, embed_model, persist_directory=None):
+    def __init__(self, processor, embed_model, persist_directory=None, collection_name=None, chunker=None,
+                 backend="chroma", quantization=None, keep_full_precision=False, rescore_factor=4, notify=None):
         """
         Initializes the ChromaCollectionCreator with a DocumentProcessor instance, embeddings configuration,
         and an optional persist directory for Chroma collection persistence.
+
+        Each document set gets its own collection named after the fingerprint of its documents,
+        so a known set of PDFs reuses its index and retrieval only covers the quiz's documents.
         
         :param processor: Instance of DocumentProcessor.
         :param embed_model: Instance of EmbeddingClient.
         :param persist_directory: Optional directory for persistence.
+        :param collection_name: Optional fixed collection name, shared by every document set.
+        :param chunker: Optional Chunker from Text_Chunker. Defaults to sentence-aware 256-token chunks.
+        :param backend: Vector store behind ``db``: "chroma", or "numpy" for the lightweight memory-mapped
+                        NumpyVectorStore suited to small and medium corpora.
+        :param quantization: Optional compact embedding storage for the numpy backend: "float16" or "int8".
+        :param keep_full_precision: With quantization, also keep the float32 embeddings on disk so the best
+                                    candidates are rescored exactly. This improves recall but makes the store
+                                    larger than unquantized storage; by default only the compact copy is kept.
+        :param rescore_factor: With full precision kept, ``rescore_factor * k`` candidates are rescored.
+        :param notify: Optional callback receiving status updates as (level, message), level "success" or
+                       "error". Defaults to Streamlit messages; headless callers pass e.g. a logging function.
         """
+        self.notify = notify or streamlit_notify
         self.processor = processor      # DocumentProcessor from Task 3
         self.embed_model = embed_model  # EmbeddingClient from Task 4
         self.persist_directory = persist_directory  # Optional directory for persistence
+        self.collection_name = collection_name  # Optional fixed collection name
+        self.chunker = chunker or get_chunker()  # Token-aware chunking strategy
+        if backend not in ("chroma", "numpy"):
+            raise ValueError(f"Unknown vector store backend: {backend}. Choose from chroma, numpy.")
+        self.backend = backend
+        if quantization and backend != "numpy":
+            raise ValueError("Quantized embedding storage requires the numpy backend.")
+        self.quantization = quantization
+        self.keep_full_precision = keep_full_precision
+        self.rescore_factor = rescore_factor
         self.db = None                  # Chroma collection
+        self.db_collection_name = None  # Name of the collection currently open in self.db
+        self.keyword_index = None       # BM25 index over the chunks of the open collection
         
-        # Load the existing Chroma collection if it exists
-        if self.persist_directory and os.path.exists(self.persist_directory):
-            self.db = Chroma(persist_directory=self.persist_directory, embedding_function=self.embed_model)
-            st.success("Loaded existing Chroma collection from disk!", icon="✅")
+        # Load the existing collection for the processed documents if it exists
+        if self.persist_directory and os.path.exists(self.persist_directory) and self.resolve_collection_name():
+            self.open_collection()
+            if self.db.get(limit=1, include=[])["ids"]:
+                self.notify("success", "Loaded existing Chroma collection for these documents from disk!")
+
+    def resolve_collection_name(self):
+        """
+        Resolves the collection for the processed documents.
+
+        :return: The fixed collection name, a name derived from the document fingerprint,
+                 or None if no documents have been processed.
+        """
+        if self.collection_name:
+            return self.collection_name
+        fingerprint = self.processor.fingerprint()
+        if not fingerprint:
+            return None
+        return f"docs_{fingerprint[:32]}"
+
+    def open_collection(self):
+        """
+        Opens (or creates) the collection for the processed documents. Store handles and keyword indexes
+        are shared process-wide, so sessions reuse one open handle and a failed handle is reopened.
+        """
+        name = self.resolve_collection_name() or "langchain"
+        options = {}
+        if self.backend == "numpy" and self.quantization:
+            options = {
+                "quantization": self.quantization,
+                "keep_full_precision": self.keep_full_precision,
+                "rescore_factor": self.rescore_factor,
+            }
+        self.db = get_vector_store(self.backend, name, self.persist_directory, self.embed_model, **options)
+        self.db_collection_name = name
+        self.keyword_index = get_keyword_index(self.keyword_index_path())
+
+    def keyword_index_path(self):
+        """
+        Returns the file the open collection's keyword index is persisted to, next to the Chroma data.
+
+        :return: The path, or None without a persist directory.
+        """
+        if not self.persist_directory or not self.db_collection_name:
+            return None
+        return os.path.join(self.persist_directory, f"{self.db_collection_name}.bm25.json")
     
-    def create_chroma_collection(self):
+    def create_chroma_collection(self, batch_size=100, pages=None):
         """
-        Create a Chroma collection from the documents processed by the DocumentProcessor instance,
-        with persistence support if a directory is provided.
+        Create or incrementally update a Chroma collection from the documents processed by the
+        DocumentProcessor instance, with persistence support if a directory is provided.
+
+        Every chunk gets a stable content-hash ID, so chunks already in the collection are skipped
+        and only new chunks are embedded and upserted. A BM25 keyword index over the same chunks is
+        maintained alongside and persisted next to the collection. Pages stream through an IngestionPipeline,
+        so splitting and indexing start with the first page and memory stays bounded.
+
+        Removing a document changes the document set's fingerprint, so the smaller set opens its own
+        collection and never retrieves chunks of the removed document.
+
+        :param batch_size: Number of chunks embedded and upserted per batch.
+        :param pages: Optional iterable of pages, e.g. DocumentProcessor.iter_pages(). Defaults to the
+                      processor's extracted pages.
         """
+        if pages is None:
+            pages = self.processor.pages
+
         # Check for processed documents
-        if len(self.processor.pages) == 0:
-            st.error("No documents found!", icon="🚨")
+        if isinstance(pages, list) and len(pages) == 0:
+            self.notify("error", "No documents found!")
             return
 
-        # Split documents into text chunks
-        splitter = CharacterTextSplitter(separator=" ", chunk_size=1024, chunk_overlap=100)
-        texts = []
+        self.open_collection()
 
-        for page in self.processor.pages:
-            text_chunks = splitter.split_text(page.page_content)
-            for text in text_chunks:
-                doc = Document(page_content=text, metadata={"source": "local"})
-                texts.append(doc)
+        # Split, embed and upsert pages as they arrive
+        pipeline = IngestionPipeline(self.split_page, self.index_batch, batch_size=batch_size)
+        stats = pipeline.run(pages)
 
-        if texts:
-            st.success(f"Successfully split pages into {len(texts)} documents!", icon="✅")
+        if stats["chunks"]:
+            self.notify("success", f"Successfully split pages into {stats['chunks']} documents!")
         else:
-            st.error("Failed to split pages!", icon="🚨")
+            self.notify("error", "Failed to split pages!")
             return
 
-        # Create the Chroma Collection with persistence
         if self.persist_directory:
-            self.db = Chroma.from_documents(
-                documents=texts,
-                embedding=self.embed_model,
-                persist_directory=self.persist_directory  # Use persistence
-            )
             self.db.persist()  # Persist the collection to disk
-        else:
-            self.db = Chroma.from_documents(
-                documents=texts,
-                embedding=self.embed_model
-            )
+            self.keyword_index.save(self.keyword_index_path())
+        if stats["indexed"]:
+            clear_plan_cache()  # Cached quiz contexts may miss the new chunks
 
-        if self.db:
-            st.success("Successfully created Chroma Collection!", icon="✅")
+        self.notify(
+            "success",
+            f"Indexed {stats['indexed']} new chunks, skipped {stats['skipped']} existing."
+        )
+        if stats["failed"]:
+            self.notify("error", f"Failed to index {stats['failed']} chunks; submit again to retry them.")
         else:
-            st.error("Failed to create Chroma Collection!", icon="🚨")
+            self.notify("success", "Successfully created Chroma Collection!")
+
+    def split_page(self, page):
+        """
+        Splits a page into chunks with stable IDs, source metadata and character offsets within the page.
+
+        :param page: A page Document from the DocumentProcessor.
+        :return: A generator of (chunk ID, Document) pairs.
+        """
+        source = page.metadata.get("source", "local")
+        document_id = page.metadata.get("document_id", source)
+        for chunk in self.chunker.split_text(page.page_content):
+            metadata = {
+                "source": source,
+                "page": page.metadata.get("page", 0),
+                "document_id": document_id,
+                "start_index": chunk.start,
+                "end_index": chunk.end,
+            }
+            if chunk.heading:
+                metadata["heading"] = chunk.heading
+            document = lc_documents.Document(page_content=chunk.text, metadata=metadata)
+            yield self.chunk_id(document_id, chunk.text), document
+
+    def index_batch(self, ids, documents):
+        """
+        Embeds and upserts the chunks of a batch that are not in the collection yet.
+
+        :param ids: Chunk IDs of the batch.
+        :param documents: Chunk Documents aligned with ``ids``.
+        :return: A tuple of (indexed, skipped) chunk counts.
+        """
+        # Keyword indexing needs no embedding call, so chunks stay searchable even if embedding fails
+        self.keyword_index.add(ids, documents)
+
+        existing = set(self.db.get(ids=ids, include=[])["ids"])
+        new = [(chunk_id, document) for chunk_id, document in zip(ids, documents) if chunk_id not in existing]
+        if new:
+            new_ids, new_documents = zip(*new)
+            self.db.add_documents(list(new_documents), ids=list(new_ids))
+        return len(new), len(existing)
+
+    @staticmethod
+    def chunk_id(document_id, text) -> str:
+        """
+        Builds a stable ID for a chunk from its document and content.
+
+        :param document_id: ID (content hash) of the source document.
+        :param text: The chunk text.
+        :return: The hex digest identifying the chunk.
+        """
+        return hashlib.sha256(f"{document_id}\0{text}".encode("utf-8")).hexdigest()
     
-    def query_chroma_collection(self, query) -> Document:
+    def search(self, query, k=4, mode="hybrid") -> list:
+        """
+        Searches the collection's chunks by embedding similarity, BM25 keywords, or both.
+
+        :param query: The query string to search for.
+        :param k: Number of results to return.
+        :param mode: "vector", "keyword" (no embedding call) or "hybrid" (reciprocal rank fusion of both).
+                     Hybrid search falls back to keywords if the embedding call fails, e.g. on exhausted quota.
+        :return: A list of (Document, score) tuples, best match first.
+        """
+        if mode not in ("vector", "keyword", "hybrid"):
+            raise ValueError(f"Unknown search mode: {mode}. Choose from vector, keyword, hybrid.")
+        if mode == "vector" or self.keyword_index is None:
+            return self.db.similarity_search_with_relevance_scores(query, k=k)
+
+        keyword_results = self.keyword_index.search(query, k=k if mode == "keyword" else 2 * k)
+        if mode == "keyword":
+            return keyword_results
+        try:
+            vector_results = self.db.similarity_search(query, k=2 * k)
+        except Exception as e:
+            print(f"Vector search failed, using keyword results only: {e}")
+            return keyword_results[:k]
+        return reciprocal_rank_fusion([vector_results, [document for document, _ in keyword_results]], k=k)
+
+    def query_chroma_collection(self, query, mode="vector") -> "Document":
         """
         Queries the created Chroma collection for documents similar to the query.
         
         :param query: The query string to search for.
+        :param mode: Search mode passed to ``search``: "vector", "keyword" or "hybrid".
         :return: The most similar document or None if no match is found.
         """
         if self.db:
-            docs = self.db.similarity_search_with_relevance_scores(query)
+            docs = self.search(query, mode=mode)
             if docs:
                 return docs[0]
             else:
-                st.error("No matching documents found!", icon="🚨")
+                self.notify("error", "No matching documents found!")
         else:
-            st.error("Chroma Collection has not been created!", icon="🚨")
+            self.notify("error", "Chroma Collection has not been created!")
 
 if __name__ == "__main__":
+    from Document_Processor import DocumentProcessor
+    from Resource_Registry import get_embedding_client
+
     st.header("Quizify - Chroma Collection Creator")
     
     # Initialize the DocumentProcessor
@@ -110,7 +279,7 @@ if __name__ == "__main__":
     }
 
     # Initialize the EmbeddingClient
-    embed_client = EmbeddingClient(**embed_config)  # Initialize from Task 4
+    embed_client = get_embedding_client(**embed_config)  # Shared across sessions
 
     # Set persistence directory
     persist_directory = "chroma_persistence_directory"
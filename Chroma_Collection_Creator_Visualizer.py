@@ -1,14 +1,10 @@
-import sys
 import os
 import streamlit as st
 
-# Adjust the path to include the root directory of your project
-sys.path.append(os.path.abspath('../../'))
-
 # Import necessary classes from other tasks
 from Document_Processor import DocumentProcessor
-from Embedding_Client import EmbeddingClient
 from Chroma_Collection_Creator import ChromaCollectionCreator
+from Resource_Registry import get_embedding_client
 from io import StringIO
 
 if __name__ == "__main__":
@@ -26,7 +22,7 @@ if __name__ == "__main__":
     
     # Initialize components
     processor = DocumentProcessor()
-    embedding_client = EmbeddingClient(**embed_config)
+    embedding_client = get_embedding_client(**embed_config)  # Shared across sessions
     chroma_creator = ChromaCollectionCreator(processor, embedding_client, persist_directory=persist_directory)
     
     # Ingest documents via DocumentProcessor (this handles file uploads)
@@ -52,11 +48,9 @@ if __name__ == "__main__":
                 st.error("Please upload at least one PDF to generate the quiz.")
                 st.stop()
 
-            # Check if Chroma collection already exists
-            # Load existing Chroma collection from disk, if it exists
-            if not chroma_creator.db:
+            # Index new chunks incrementally; an existing collection is reused as-is
+            if processor.pages:
                 chroma_creator.create_chroma_collection()
-                st.success("New Chroma collection successfully created!", icon="✅")
                 
             # Query the Chroma collection for the entered topic
             document = chroma_creator.query_chroma_collection(topic_input)
@@ -0,0 +1,135 @@
+import threading
+from collections import OrderedDict
+
+from Keyword_Index import reciprocal_rank_fusion
+
+_plan_cache = OrderedDict()  # (collection, topic, pool size, fetch size, diversity, mode) -> retrieved chunks
+_plan_cache_lock = threading.Lock()
+_PLAN_CACHE_SIZE = 64
+
+class ContextPlanner:
+    def __init__(self, db, topic, pool_size=20, fetch_k=50, chunks_per_question=4, lambda_mult=0.5, cache_key=None,
+                 keyword_index=None, mode=None):
+        """
+        Initializes a context planner that retrieves a diverse pool of chunks once per quiz and hands
+        each question request a different slice of it, instead of the same top-k for every question.
+
+        :param db: The vector store (e.g. ChromaCollectionCreator.db).
+        :param topic: The quiz topic used as the retrieval query.
+        :param pool_size: Number of chunks retrieved for the whole quiz.
+        :param fetch_k: Number of candidates considered by the MMR diversity selection.
+        :param chunks_per_question: Number of chunks given to a single-question request.
+        :param lambda_mult: MMR trade-off between relevance (1.0) and diversity (0.0).
+        :param cache_key: Optional name of the collection; when given, the retrieval is cached across quizzes.
+        :param keyword_index: Optional BM25Index over the collection's chunks.
+        :param mode: "vector", "keyword" (no embedding call) or "hybrid". Defaults to hybrid when a keyword
+                     index is given and to vector otherwise.
+        """
+        self.db = db
+        self.topic = topic
+        self.pool_size = pool_size
+        self.fetch_k = max(fetch_k, pool_size)
+        self.chunks_per_question = chunks_per_question
+        self.lambda_mult = lambda_mult
+        self.cache_key = cache_key
+        self.keyword_index = keyword_index
+        self.mode = mode or ("hybrid" if keyword_index else "vector")
+        if self.mode not in ("vector", "keyword", "hybrid"):
+            raise ValueError(f"Unknown retrieval mode: {self.mode}. Choose from vector, keyword, hybrid.")
+        if self.mode != "vector" and keyword_index is None:
+            raise ValueError(f"Retrieval mode {self.mode} requires a keyword index.")
+        self.chunks = None
+        self._lock = threading.Lock()
+        self._offset = 0  # Start of the next slice; advances by the size of every slice handed out
+
+    def plan(self) -> list:
+        """
+        Retrieves the chunk pool on first use; later calls and later quizzes on the same collection and
+        topic reuse the cached result.
+
+        :return: The retrieved chunks, most relevant first.
+        """
+        with self._lock:
+            if self.chunks is not None:
+                return self.chunks
+
+            key = (self.cache_key, self.topic.strip().lower(), self.pool_size, self.fetch_k, self.lambda_mult, self.mode)
+            with _plan_cache_lock:
+                if self.cache_key and key in _plan_cache:
+                    _plan_cache.move_to_end(key)
+                    self.chunks = _plan_cache[key]
+                    return self.chunks
+
+            chunks = self.retrieve()
+
+            if self.cache_key:
+                with _plan_cache_lock:
+                    _plan_cache[key] = chunks
+                    while len(_plan_cache) > _PLAN_CACHE_SIZE:
+                        _plan_cache.popitem(last=False)
+            self.chunks = chunks
+            return chunks
+
+    def retrieve(self) -> list:
+        """
+        Retrieves the chunk pool with the configured mode. Hybrid retrieval falls back to keyword
+        results if the embedding call fails, e.g. when the embedding quota is exhausted.
+
+        :return: The retrieved chunks, most relevant first.
+        """
+        keyword_chunks = []
+        if self.mode != "vector":
+            keyword_chunks = [chunk for chunk, _ in self.keyword_index.search(self.topic, k=self.pool_size)]
+            if self.mode == "keyword":
+                return keyword_chunks
+
+        try:
+            try:
+                vector_chunks = self.db.max_marginal_relevance_search(
+                    self.topic, k=self.pool_size, fetch_k=self.fetch_k, lambda_mult=self.lambda_mult
+                )
+            except NotImplementedError:
+                vector_chunks = self.db.similarity_search(self.topic, k=self.pool_size)
+        except Exception as e:
+            if self.mode == "vector":
+                raise
+            print(f"Vector retrieval failed, using keyword results only: {e}")
+            return keyword_chunks
+
+        if self.mode == "vector":
+            return vector_chunks
+        return [chunk for chunk, _ in reciprocal_rank_fusion([vector_chunks, keyword_chunks], k=self.pool_size)]
+
+    def next_context(self, num_questions=1) -> list:
+        """
+        Returns the next slice of the pool. Consecutive requests get consecutive, non-overlapping slices,
+        wrapping around once the pool is used up.
+
+        :param num_questions: Number of questions the request asks for; batch requests get a larger slice.
+        :return: A list of chunks.
+        """
+        chunks = self.plan()
+        if not chunks:
+            return []
+        size = min(len(chunks), self.chunks_per_question * num_questions)
+        with self._lock:
+            start = self._offset
+            self._offset = (start + size) % len(chunks)
+        return [chunks[(start + i) % len(chunks)] for i in range(size)]
+
+    @staticmethod
+    def format_context(chunks) -> str:
+        """
+        Formats chunks as prompt context.
+
+        :param chunks: The chunks to include.
+        :return: The chunk texts separated by blank lines.
+        """
+        return "\n\n".join(chunk.page_content for chunk in chunks)
+
+def clear_plan_cache():
+    """
+    Drops all cached retrieval results, e.g. after a collection was re-indexed.
+    """
+    with _plan_cache_lock:
+        _plan_cache.clear()
@@ -1,45 +1,233 @@
-import streamlit as st
-from langchain_community.document_loaders import PyPDFLoader
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+import io
+import multiprocessing
 import os
-import tempfile
-import uuid
+import hashlib
+import threading
+from Lazy_Import import lazy_import
+
+# Heavy dependencies load on first use; extraction workers only need pypdf
+st = lazy_import("streamlit")
+pypdf = lazy_import("pypdf")
+lc_documents = lazy_import("langchain_core.documents")
+
+def _open_pdf(pdf_data):
+    """
+    Opens a PDF from its in-memory contents or from a file path.
+    """
+    if isinstance(pdf_data, (str, os.PathLike)):
+        return pypdf.PdfReader(pdf_data)  # Pages are read from disk on demand
+    return pypdf.PdfReader(io.BytesIO(pdf_data))  # BytesIO shares a bytes object instead of copying it
+
+def _extraction_context():
+    """
+    Returns the start method for extraction workers. The Streamlit server runs other threads, and forking a
+    multi-threaded process can deadlock the child, so workers start from a fresh forkserver or spawned process.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+def extract_document(pdf_data, source, document_id) -> list:
+    """
+    Extracts the text of every page of a PDF, parsing it once.
+
+    :param pdf_data: The PDF file contents, or a path to the PDF.
+    :param source: Original file name recorded as the page source.
+    :param document_id: Content hash of the PDF.
+    :return: A list of Documents, one per page, in page order.
+    """
+    reader = _open_pdf(pdf_data)
+    return [
+        lc_documents.Document(
+            page_content=page.extract_text(),
+            metadata={"source": source, "page": number, "document_id": document_id}
+        )
+        for number, page in enumerate(reader.pages)
+    ]
+
+class PageCache:
+    def __init__(self, max_documents=32, max_chars=50000000):
+        """
+        Initializes a bounded, thread-safe LRU cache of extracted pages keyed by document content hash.
+
+        :param max_documents: Maximum number of documents kept in the cache.
+        :param max_chars: Maximum total number of extracted text characters kept in the cache.
+        """
+        self.max_documents = max_documents
+        self.max_chars = max_chars
+        self._lock = threading.Lock()
+        self._documents = OrderedDict()  # Document ID -> (pages, number of characters)
+        self._chars = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, document_id):
+        """
+        Looks up the pages of a document.
+
+        :param document_id: Content hash of the document.
+        :return: The cached pages, or None if the document is not cached.
+        """
+        with self._lock:
+            entry = self._documents.get(document_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(document_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, document_id, pages):
+        """
+        Stores the pages of a document, evicting least recently used documents beyond the bounds.
+
+        :param document_id: Content hash of the document.
+        :param pages: The extracted pages.
+        """
+        chars = sum(len(page.page_content) for page in pages)
+        with self._lock:
+            if document_id in self._documents:
+                self._chars -= self._documents.pop(document_id)[1]
+            self._documents[document_id] = (pages, chars)
+            self._chars += chars
+            while len(self._documents) > 1 and (
+                len(self._documents) > self.max_documents or self._chars > self.max_chars
+            ):
+                self._chars -= self._documents.popitem(last=False)[1][1]
+
+_page_cache = PageCache()  # Shared across Streamlit reruns and sessions of this process
 
 class DocumentProcessor:
-    def __init__(self):
+    def __init__(self, max_workers=None, cache=None):
         """
         Initialize the DocumentProcessor class.
+
+        :param max_workers: Number of worker processes used for PDF extraction. Defaults to the CPU count.
+        :param cache: Optional PageCache. Defaults to the process-wide cache; pass False to disable.
         """
         self.pages = []  # List to keep track of pages from all documents
+        self.document_ids = []  # Content hashes of the processed documents
+        self.files = []  # Uploaded (file name, file bytes) tuples, kept when pages are streamed
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache = _page_cache if cache is None else cache
     
-    def ingest_documents(self):
+    def ingest_documents(self, stream=False):
         """
         Ingest PDF documents uploaded by the user.
+
+        :param stream: Only record the uploads and their document IDs instead of extracting every page up front;
+                       pages are then extracted with iter_pages(self.files) while they are indexed.
         """
         # Render a file uploader widget to allow users to upload multiple PDF files
         uploaded_files = st.file_uploader("Upload PDF files", type="pdf", accept_multiple_files=True)
         
         if uploaded_files is not None:
-            for uploaded_file in uploaded_files:
-                # Generate a unique identifier to append to the file's original name
-                unique_id = uuid.uuid4().hex
-                original_name, file_extension = os.path.splitext(uploaded_file.name)
-                temp_file_name = f"{original_name}_{unique_id}{file_extension}"
-                temp_file_path = os.path.join(tempfile.gettempdir(), temp_file_name)
-
-                # Write the uploaded PDF to a temporary file
-                with open(temp_file_path, 'wb') as f:
-                    f.write(uploaded_file.getvalue())
-
-                # Process the temporary file using PyPDFLoader
-                loader = PyPDFLoader(temp_file_path)
-                extracted_pages = loader.load()
-                self.pages.extend(extracted_pages)
- 
-                # Clean up by deleting the temporary file to free up space
-                os.unlink(temp_file_path)
+            # getvalue() returns the upload buffer itself, so the PDFs are parsed without a copy or a disk write
+            files = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+
+            if stream:
+                self.files = files
+                self.document_ids = list(dict.fromkeys(self.hash_document(file_bytes) for _, file_bytes in files))
+                st.write(f"Total documents uploaded: {len(self.document_ids)}")
+                return
+
+            # Reruns replace the pages instead of appending, so every document is held once
+            self.pages = self.extract_files(files)
             
             # Display the total number of pages processed to the user
             st.write(f"Total pages processed: {len(self.pages)}")
+
+    def extract_files(self, files) -> list:
+        """
+        Extracts the pages of several PDFs on a process pool, one file per task, so each PDF is parsed once.
+        Documents found in the page cache are not parsed again, and duplicate uploads are kept once.
+
+        :param files: A list of (file name, file bytes or file path) tuples.
+        :return: A list of Documents in upload order, then page order.
+        """
+        tasks = []
+        document_pages = OrderedDict()  # Document ID -> pages, in upload order
+        for name, pdf_data in files:
+            document_id = self.hash_document(pdf_data)
+            if document_id in document_pages:
+                continue
+            cached = self.cache.get(document_id) if self.cache else None
+            document_pages[document_id] = cached
+            if cached is None:
+                tasks.append((pdf_data, name, document_id))
+
+        # A pool only pays off when there is more than one file to parse
+        if len(tasks) <= 1 or self.max_workers == 1:
+            results = [extract_document(*task) for task in tasks]
+        else:
+            # Each task receives only its own file's path or bytes
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(tasks)), mp_context=_extraction_context()
+            ) as executor:
+                results = list(executor.map(extract_document, *zip(*tasks)))  # Keeps task order
+
+        for (_, _, document_id), pages in zip(tasks, results):
+            document_pages[document_id] = pages
+            if self.cache:
+                self.cache.put(document_id, pages)
+
+        self.document_ids = list(document_pages)
+        return [page for pages in document_pages.values() for page in pages or []]
+
+    def iter_pages(self, files):
+        """
+        Lazily extracts pages one at a time, for streaming ingestion of documents too large to hold
+        in memory. Pages are not cached. The document IDs are recorded when it is called, before any
+        page is extracted, so the document set's fingerprint is known up front.
+
+        :param files: A list of (file name, file bytes or file path) tuples.
+        :return: A generator of page Documents in file order, then page order.
+        """
+        documents = OrderedDict()  # Document ID -> (file name, file data)
+        for name, pdf_data in files:
+            documents.setdefault(self.hash_document(pdf_data), (name, pdf_data))
+        self.document_ids = list(documents)
+        return self._generate_pages(documents)
+
+    @staticmethod
+    def _generate_pages(documents):
+        # Kept apart from iter_pages, whose body would otherwise only run on the first next()
+        for document_id, (name, pdf_data) in documents.items():
+            reader = _open_pdf(pdf_data)
+            for page in range(len(reader.pages)):
+                yield lc_documents.Document(
+                    page_content=reader.pages[page].extract_text(),
+                    metadata={"source": name, "page": page, "document_id": document_id}
+                )
+
+    @staticmethod
+    def hash_document(pdf_data) -> str:
+        """
+        Computes the content hash of a PDF, reading files from disk in blocks.
+
+        :param pdf_data: The PDF file contents, or a path to the PDF.
+        :return: The hex digest of the contents.
+        """
+        if not isinstance(pdf_data, (str, os.PathLike)):
+            return hashlib.sha256(pdf_data).hexdigest()
+        digest = hashlib.sha256()
+        with open(pdf_data, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fingerprint(self):
+        """
+        Computes a fingerprint of the processed document set, independent of upload order.
+
+        :return: A hex digest of the sorted document hashes, or None if no documents were processed.
+        """
+        document_ids = sorted(set(self.document_ids) or {page.metadata.get("document_id", "") for page in self.pages})
+        if not document_ids:
+            return None
+        return hashlib.sha256("\n".join(document_ids).encode("utf-8")).hexdigest()
            
         
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+# Kept next to the persisted collections rather than in the working directory
+DEFAULT_PATH = os.path.join("chroma_persistence_directory", "embedding_cache.sqlite")
+
+class EmbeddingCache:
+    def __init__(self, path=DEFAULT_PATH, memory_items=10000, max_bytes=512 * 1024 * 1024):
+        """
+        Initializes a content-addressed embedding cache: a persistent SQLite store of float32
+        vectors keyed by a hash of model name and text, fronted by an in-memory LRU.
+
+        :param path: Path of the SQLite database file.
+        :param memory_items: Maximum number of vectors kept in the in-memory LRU.
+        :param max_bytes: Maximum total size of stored vectors on disk before the least recently
+                          used entries are evicted.
+        """
+        self.path = path
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # Key -> vector, most recently used last
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+        # Counters exposed through stats()
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(model_name, text) -> str:
+        """
+        Builds the cache key for a text embedded with a given model.
+
+        :param model_name: Name of the embedding model.
+        :param text: The embedded text.
+        :return: The hex digest identifying the embedding.
+        """
+        return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key, vector):
+        """
+        Stores a vector in the in-memory LRU. Caller must hold the lock.
+        """
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, model_name, texts) -> list:
+        """
+        Looks up the embeddings of several texts.
+
+        :param model_name: Name of the embedding model.
+        :param texts: The texts to look up.
+        :return: A list aligned with ``texts`` holding each vector, or None for a cache miss.
+        """
+        keys = [self.make_key(model_name, text) for text in texts]
+        results = [None] * len(keys)
+
+        with self._lock:
+            missing = {}
+            for i, key in enumerate(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    results[i] = self._memory[key]
+                    self.memory_hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+
+            # SQLite limits the number of bound parameters, so look up disk entries in chunks
+            found = []
+            missing_keys = list(missing)
+            for start in range(0, len(missing_keys), 500):
+                chunk = missing_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    vector = vector.tolist()
+                    self._remember(key, vector)
+                    for i in missing[key]:
+                        results[i] = vector
+                    found.append(key)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?", [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            hits = sum(1 for vector in results if vector is not None)
+            self.hits += hits
+            self.misses += len(results) - hits
+
+        return results
+
+    def get(self, model_name, text):
+        """
+        Looks up the embedding of a single text.
+
+        :param model_name: Name of the embedding model.
+        :param text: The text to look up.
+        :return: The vector, or None for a cache miss.
+        """
+        return self.get_many(model_name, [text])[0]
+
+    def put_many(self, model_name, texts, vectors):
+        """
+        Stores the embeddings of several texts, evicting least recently used entries if the
+        store grows beyond ``max_bytes``.
+
+        :param model_name: Name of the embedding model.
+        :param texts: The embedded texts.
+        :param vectors: The embedding vectors aligned with ``texts``.
+        """
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.make_key(model_name, text)
+                blob = array("f", vector).tobytes()
+                rows.append((key, blob, len(blob), now))
+                self._remember(key, list(vector))
+
+            for key, blob, size, _ in rows:
+                previous = self._conn.execute("SELECT size FROM embeddings WHERE key = ?", (key,)).fetchone()
+                self._total_bytes += size - (previous[0] if previous else 0)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, size, last_access) VALUES (?, ?, ?, ?)", rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def put(self, model_name, text, vector):
+        """
+        Stores the embedding of a single text.
+
+        :param model_name: Name of the embedding model.
+        :param text: The embedded text.
+        :param vector: The embedding vector.
+        """
+        self.put_many(model_name, [text], [vector])
+
+    def _evict(self):
+        """
+        Deletes least recently used entries until the store fits in ``max_bytes``. Caller must hold the lock.
+        """
+        if not self.max_bytes or self._total_bytes <= self.max_bytes:
+            return
+        # Evict down to 90% of the limit so eviction does not run on every insert
+        target = self.max_bytes * 0.9
+        for key, size in self._conn.execute("SELECT key, size FROM embeddings ORDER BY last_access").fetchall():
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM embeddings WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        :return: A dictionary with hit, miss, eviction and size counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._total_bytes,
+            }
+
+    def close(self):
+        """
+        Closes the underlying SQLite connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+_embedding_caches = {}
+_embedding_caches_lock = threading.Lock()
+
+def get_embedding_cache(path=DEFAULT_PATH, **kwargs) -> EmbeddingCache:
+    """
+    Returns the process-wide embedding cache for a database path, creating it on first use.
+
+    :param path: Path of the SQLite database file.
+    :param kwargs: EmbeddingCache arguments used when the cache is first created.
+    :return: The shared EmbeddingCache instance.
+    """
+    path = os.path.abspath(path)
+    with _embedding_caches_lock:
+        if path not in _embedding_caches:
+            _embedding_caches[path] = EmbeddingCache(path, **kwargs)
+        return _embedding_caches[path]
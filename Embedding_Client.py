@@ -1,22 +1,46 @@
-import streamlit as st
-from langchain_google_vertexai import VertexAIEmbeddings
 import getpass
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from Rate_Limiter import get_rate_limiter, estimate_tokens
+from Embedding_Cache import get_embedding_cache
+from Lazy_Import import lazy_import
+
+# Heavy dependencies load on first use
+st = lazy_import("streamlit")
+vertexai = lazy_import("langchain_google_vertexai")
 
 class EmbeddingClient:
-    def __init__(self, model_name, project, location):
+    def __init__(self, model_name, project, location, rate_limiter=None, cache=None, client=None,
+                 batch_size=100, max_batch_tokens=15000, max_workers=4, max_retries=3):
         """
         Initialize the EmbeddingClient with the specified model, project, and location.
         
         :param model_name: Name of the embedding model to use.
         :param project: Google Cloud project ID.
         :param location: Google Cloud location.
+        :param rate_limiter: Optional RateLimiter. Defaults to the shared Vertex embeddings quota limiter.
+        :param cache: Optional EmbeddingCache. Defaults to the shared on-disk cache; pass False to disable.
+        :param client: Optional embedding backend (e.g. a local fake for benchmarks). Defaults to Vertex AI.
+        :param batch_size: Maximum number of texts sent in one embedding request.
+        :param max_batch_tokens: Maximum estimated tokens sent in one embedding request.
+        :param max_workers: Number of batches sent concurrently.
+        :param max_retries: Retries for a failed batch before it is reported as failed.
         """
-        self.client = VertexAIEmbeddings(
+        self.model_name = model_name
+        self.client = client or vertexai.VertexAIEmbeddings(
             model_name=model_name,
             project=project,
             location=location
         )
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or get_rate_limiter(
+            "vertex-embeddings", requests_per_minute=600, tokens_per_minute=None
+        )
+        self.cache = get_embedding_cache() if cache is None else cache
         
     def embed_query(self, query):
         """
@@ -25,22 +49,130 @@ class EmbeddingClient:
         :param query: The text query to embed.
         :return: The embedding vectors for the query.
         """
-        vectors = self.client.embed_query(query)
+        if self.cache:
+            vectors = self.cache.get(self.model_name, query)
+            if vectors is not None:
+                return vectors
+
+        vectors = self.rate_limiter.call(self.client.embed_query, query, tokens=estimate_tokens(query))
+        if self.cache and vectors:
+            self.cache.put(self.model_name, query, vectors)
         return vectors
     
     def embed_documents(self, documents):
         """
-        Embed a list of documents.
+        Embed a list of documents. Only documents missing from the cache are sent to the backend.
         
         :param documents: A list of documents to embed.
         :return: The embedding vectors for the documents.
         """
         try:
-            return self.client.embed_documents(documents)
+            if not self.cache:
+                return self._embed_documents(documents)
+
+            vectors = self.cache.get_many(self.model_name, documents)
+            misses = {}  # Missing text -> positions, so repeated chunks are embedded once
+            for i, vector in enumerate(vectors):
+                if vector is None:
+                    misses.setdefault(documents[i], []).append(i)
+            if misses:
+                missing_documents = list(misses)
+                embedded = self._embed_documents(missing_documents)  # Stored in the cache per batch
+                for document, vector in zip(missing_documents, embedded):
+                    for i in misses[document]:
+                        vectors[i] = vector
+            return vectors
         except AttributeError:
             print("Method embed_documents not defined for the client.")
             return None
 
+    def make_batches(self, documents) -> list:
+        """
+        Splits documents into consecutive batches limited by item count and estimated tokens.
+
+        :param documents: A list of documents to embed.
+        :return: A list of (start, end) index ranges into ``documents``.
+        """
+        batches = []
+        start, tokens = 0, 0
+        for i, document in enumerate(documents):
+            document_tokens = estimate_tokens(document)
+            if i > start and (i - start >= self.batch_size or tokens + document_tokens > self.max_batch_tokens):
+                batches.append((start, i))
+                start, tokens = i, 0
+            tokens += document_tokens
+        if start < len(documents):
+            batches.append((start, len(documents)))
+        return batches
+
+    def _embed_documents(self, documents):
+        """
+        Sends documents to the embedding backend in batches, several batches at a time.
+        Successful batches are written to the cache as they finish, so a failed batch only
+        costs its own documents when the ingest is retried.
+
+        :param documents: A list of documents to embed.
+        :return: The embedding vectors for the documents, in input order.
+        """
+        batches = self.make_batches(documents)
+        vectors = [None] * len(documents)
+        failed = []
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(batches)))) as executor:
+            futures = {
+                executor.submit(self._embed_batch, documents[start:end]): (start, end)
+                for start, end in batches
+            }
+            for future in as_completed(futures):
+                start, end = futures[future]
+                try:
+                    embedded = future.result()
+                except Exception as e:
+                    print(f"Embedding batch {start}-{end} failed: {e}")
+                    failed.append((start, end))
+                    continue
+                vectors[start:end] = embedded
+                if self.cache:
+                    self.cache.put_many(self.model_name, documents[start:end], embedded)
+
+        if failed:
+            failed_documents = sum(end - start for start, end in failed)
+            raise RuntimeError(
+                f"{len(failed)} of {len(batches)} embedding batches failed ({failed_documents} documents)."
+            )
+        return vectors
+
+    def _embed_batch(self, documents):
+        """
+        Embeds one batch under the rate limiter, retrying transient failures with backoff.
+        Quota errors are retried by the rate limiter itself.
+
+        :param documents: The documents in the batch.
+        :return: The embedding vectors for the batch.
+        """
+        tokens = sum(estimate_tokens(document) for document in documents)
+        for attempt in range(self.max_retries + 1):
+            try:
+                embedded = self.rate_limiter.call(self.client.embed_documents, documents, tokens=tokens)
+                if len(embedded) != len(documents):
+                    raise ValueError(f"Expected {len(documents)} embeddings, got {len(embedded)}.")
+                return embedded
+            except AttributeError:
+                raise
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                print(f"Embedding batch failed ({e}), retrying ({attempt + 1}/{self.max_retries}).")
+                time.sleep(2 ** attempt)
+
+    def cache_stats(self) -> dict:
+        """
+        Returns the embedding cache hit/miss counters.
+
+        :return: The cache statistics, or an empty dictionary if caching is disabled.
+        """
+        return self.cache.stats() if self.cache else {}
+
 # Streamlit interface
 if __name__ == "__main__":
     # Define the model, project, and location
@@ -61,5 +193,6 @@ if __name__ == "__main__":
         if vectors:
             st.write(vectors)
             st.success("Successfully retrieved and displayed the embeddings.")
+            st.write(embedding_client.cache_stats())
         else:
             st.error("Failed to retrieve embeddings.")
\ No newline at end of file
@@ -0,0 +1,130 @@
+import queue
+import threading
+import time
+
+_DONE = object()  # Marks the end of a stage's output
+
+class IngestionPipeline:
+    def __init__(self, split_page, index_batch, batch_size=100, queue_size=4):
+        """
+        Initializes a streaming ingestion pipeline: pages are split, deduplicated and indexed as they
+        arrive, with bounded queues between the stages so a fast stage waits for a slow one instead
+        of buffering the whole corpus in memory.
+
+        :param split_page: Function mapping a page to an iterable of (chunk ID, Document) pairs.
+        :param index_batch: Function embedding and upserting a batch; called with (chunk IDs, Documents)
+                            and returning a tuple of (indexed, skipped) counts.
+        :param batch_size: Number of chunks per indexing batch.
+        :param queue_size: Maximum number of pages or batches waiting between two stages.
+        """
+        self.split_page = split_page
+        self.index_batch = index_batch
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    def run(self, pages) -> dict:
+        """
+        Runs the pipeline over an iterable (typically a generator) of pages.
+
+        :param pages: The pages to ingest.
+        :return: A dictionary of counters and timings for the run.
+        """
+        page_queue = queue.Queue(maxsize=self.queue_size)
+        batch_queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors = []
+        stats = {
+            "pages": 0, "chunks": 0, "duplicates": 0, "indexed": 0, "skipped": 0, "failed": 0,
+            "document_ids": set(), "time_to_first_chunk": None, "elapsed": None,
+        }
+        started = time.perf_counter()
+
+        def put(q, item):
+            # Block while the next stage is busy, but give up if the pipeline is stopping
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def extract():
+            try:
+                for page in pages:
+                    if not put(page_queue, page):
+                        return
+                    stats["pages"] += 1
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                put(page_queue, _DONE)
+
+        def split():
+            seen = set()  # Chunk IDs only, so memory stays small compared to the chunk texts
+            ids, documents = [], []
+            try:
+                while True:
+                    page = get(page_queue)
+                    if page is _DONE:
+                        break
+                    for chunk_id, document in self.split_page(page):
+                        stats["document_ids"].add(document.metadata.get("document_id"))
+                        if chunk_id in seen:
+                            stats["duplicates"] += 1
+                            continue
+                        seen.add(chunk_id)
+                        stats["chunks"] += 1
+                        ids.append(chunk_id)
+                        documents.append(document)
+                        if len(ids) >= self.batch_size:
+                            if not put(batch_queue, (ids, documents)):
+                                return
+                            ids, documents = [], []
+                if ids:
+                    put(batch_queue, (ids, documents))
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                put(batch_queue, _DONE)
+
+        threads = [threading.Thread(target=extract, daemon=True), threading.Thread(target=split, daemon=True)]
+        for thread in threads:
+            thread.start()
+
+        # Index in the calling thread; embedding inside a batch is already parallel
+        try:
+            while True:
+                batch = get(batch_queue)
+                if batch is _DONE:
+                    break
+                ids, documents = batch
+                try:
+                    indexed, skipped = self.index_batch(ids, documents)
+                except Exception as e:
+                    print(f"Failed to index chunk batch: {e}")
+                    stats["failed"] += len(ids)
+                    continue
+                stats["indexed"] += indexed
+                stats["skipped"] += skipped
+                if indexed + skipped and stats["time_to_first_chunk"] is None:
+                    stats["time_to_first_chunk"] = time.perf_counter() - started
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        stats["elapsed"] = time.perf_counter() - started
+        if errors:
+            raise errors[0]
+        return stats
@@ -0,0 +1,225 @@
+import json
+
+_WHITESPACE = " \t\r\n"
+_PRIMITIVE_CHARS = set("-+.0123456789eEtruefalsn")
+_CLOSERS = {"}": "{", "]": "["}
+
+class MalformedStreamError(ValueError):
+    """
+    Raised as soon as a streamed response can no longer become the expected JSON.
+    """
+
+class IncrementalJSONParser:
+    def __init__(self, allowed_keys=None, max_preamble=200):
+        """
+        Initializes a parser that consumes a JSON response chunk by chunk as it streams from the model.
+        The root may be an object or a list of objects; fields of the current object become available
+        as soon as their value is complete, and a string value can be read while it is still arriving.
+
+        :param allowed_keys: Optional collection of field names; any other key aborts the stream.
+        :param max_preamble: Maximum number of characters (e.g. a markdown fence) allowed before the JSON starts.
+        """
+        self.allowed_keys = set(allowed_keys) if allowed_keys else None
+        self.max_preamble = max_preamble
+        self.buffer = ""
+        self.items = []        # Completed objects of the root (the root itself for an object root)
+        self.fields = {}       # Completed fields of the object being streamed
+        self.complete = False
+        self._pos = 0
+        self._root = None      # Offset of the root's first character
+        self._item_depth = None
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._key = None
+        self._after_colon = False
+        self._value_start = None
+        self._primitive = False
+        self._expect = None    # Separator required next inside the object being streamed (":" or ",")
+        self._after_comma = False  # A "," was read and the next field name has not arrived yet
+        self._list_state = None    # For a list root: "item" (an object is required next) or "separator"
+
+    def feed(self, text) -> dict:
+        """
+        Consumes the next chunk of the response.
+
+        :param text: The chunk text.
+        :return: A snapshot of the object being streamed (see ``snapshot``).
+        :raises MalformedStreamError: If the response is not valid JSON of the expected shape.
+        """
+        self.buffer += text
+        if not self.complete:
+            self._scan()
+        return self.snapshot()
+
+    def snapshot(self) -> dict:
+        """
+        Returns the completed fields of the object being streamed, plus the decoded prefix of a string
+        value that is still arriving.
+
+        :return: A dictionary of field values.
+        """
+        fields = dict(self.fields)
+        if self._in_string and self._after_colon and self._depth_is_item() and self._key is not None:
+            literal = self.buffer[self._string_start:self._pos]
+            if self._escape:
+                literal = literal[:-1]
+            for end in range(len(literal), max(len(literal) - 6, 0), -1):
+                # Trim a partial escape sequence such as \u00 at the end of the prefix
+                try:
+                    fields[self._key] = json.loads(literal[:end] + '"')
+                    break
+                except json.JSONDecodeError:
+                    continue
+        return fields
+
+    def result(self):
+        """
+        Decodes the complete response.
+
+        :return: The decoded root value.
+        :raises MalformedStreamError: If the stream ended before the JSON was complete.
+        """
+        if not self.complete:
+            raise MalformedStreamError("The response ended before the JSON was complete.")
+        try:
+            return json.loads(self.buffer[self._root:self._pos])
+        except json.JSONDecodeError as e:
+            raise MalformedStreamError(f"Invalid JSON: {e}") from e
+
+    def _depth_is_item(self) -> bool:
+        return self._item_depth is not None and len(self._stack) == self._item_depth
+
+    def _fail(self, message):
+        raise MalformedStreamError(f"{message} at offset {self._pos}.")
+
+    def _finish_value(self, end):
+        # Records the value that started at _value_start as a field of the current object
+        try:
+            self.fields[self._key] = json.loads(self.buffer[self._value_start:end])
+        except json.JSONDecodeError:
+            self._fail(f"Invalid value for field {self._key!r}")
+        self._value_start = None
+        self._primitive = False
+        self._expect = ","
+
+    def _scan(self):
+        buffer = self.buffer
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+
+            if self._root is None:
+                if char in "{[":
+                    self._root = self._pos
+                    self._item_depth = 1 if char == "{" else 2
+                    if char == "[":
+                        self._list_state = "start"
+                elif self._pos >= self.max_preamble:
+                    self._fail("No JSON found in the response")
+                else:
+                    self._pos += 1
+                    continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth_is_item():
+                        value = json.loads(buffer[self._string_start:self._pos + 1])
+                        if self._after_colon:
+                            self.fields[self._key] = value
+                            self._value_start = None
+                            self._expect = ","
+                        else:
+                            if self.allowed_keys is not None and value not in self.allowed_keys:
+                                self._fail(f"Unexpected field {value!r}")
+                            self._key = value
+                            self._expect = ":"
+                            self._after_comma = False
+                self._pos += 1
+                continue
+
+            item_level = self._depth_is_item()
+            list_level = self._list_state is not None and len(self._stack) == 1
+            if self._primitive and (char in _WHITESPACE or char in ",}]"):
+                self._finish_value(self._pos)
+
+            if char in _WHITESPACE:
+                pass
+            elif item_level and self._expect and char != self._expect and not (self._expect == "," and char == "}"):
+                self._fail(f"Expected {self._expect!r}")
+            elif list_level and char not in "{,]":
+                self._fail("Expected an object")
+            elif char == '"':
+                if item_level and self._after_colon:
+                    self._value_start = self._pos
+                self._in_string = True
+                self._string_start = self._pos
+            elif char in "{[":
+                if item_level:
+                    if not self._after_colon:
+                        self._fail("Expected a field name")
+                    self._value_start = self._pos
+                if list_level:
+                    if self._list_state == "separator":
+                        self._fail("Expected ','")
+                    self._list_state = "item"
+                self._stack.append(char)
+                if self._depth_is_item():
+                    if char != "{":
+                        self._fail("Expected an object")
+                    self.fields = {}
+                    self._key = None
+                    self._after_colon = False
+                    self._after_comma = False
+                    self._expect = None
+            elif char in _CLOSERS:
+                if not self._stack or self._stack[-1] != _CLOSERS[char]:
+                    self._fail(f"Unbalanced {char!r}")
+                if item_level:
+                    if self._expect != "," and (self._after_colon or self._after_comma):
+                        self._fail("Expected a value" if self._after_colon else "Unexpected ','")
+                    # The object being streamed is complete
+                    self.items.append(self.fields)
+                    if self._list_state is not None:
+                        self._list_state = "separator"
+                elif list_level and self._list_state == "item":
+                    self._fail("Unexpected ','")
+                self._stack.pop()
+                if self._depth_is_item() and self._value_start is not None:
+                    self._finish_value(self._pos + 1)
+                if not self._stack:
+                    self.complete = True
+                    self._pos += 1
+                    return
+            elif char == ":":
+                if item_level:
+                    if self._key is None or self._after_colon:
+                        self._fail("Unexpected ':'")
+                    self._after_colon = True
+                    self._expect = None
+            elif char == ",":
+                if item_level:
+                    if self._expect != ",":
+                        self._fail("Unexpected ','")
+                    self._after_colon = False
+                    self._after_comma = True
+                    self._key = None
+                    self._expect = None
+                elif list_level:
+                    if self._list_state != "separator":
+                        self._fail("Unexpected ','")
+                    self._list_state = "item"
+            elif char in _PRIMITIVE_CHARS:
+                if item_level and self._value_start is None:
+                    if not self._after_colon:
+                        self._fail("Expected a field name")
+                    self._value_start = self._pos
+                    self._primitive = True
+            else:
+                self._fail(f"Unexpected character {char!r}")
+            self._pos += 1
@@ -0,0 +1,168 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+from Lazy_Import import lazy_import
+
+lc_documents = lazy_import("langchain_core.documents")  # Loaded on first search or load
+
+_TERM_PATTERN = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were what when "
+    "which who why with how".split()
+)
+
+def tokenize(text) -> list:
+    """
+    Splits text into lower-case index terms, dropping common English stopwords.
+
+    :param text: The text to tokenize.
+    :return: The list of terms.
+    """
+    return [term for term in _TERM_PATTERN.findall(text.lower()) if term not in _STOPWORDS]
+
+class BM25Index:
+    def __init__(self, k1=1.5, b=0.75):
+        """
+        Initializes an in-memory BM25 inverted index over chunk Documents. Keyword queries need no
+        embedding call, so they are fast and keep working when the embedding quota is exhausted.
+
+        :param k1: BM25 term frequency saturation.
+        :param b: BM25 document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self._documents = {}  # Chunk ID -> (text, metadata)
+        self._lengths = {}    # Chunk ID -> number of terms
+        self._postings = {}   # Term -> {chunk ID: term frequency}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, chunk_id):
+        return chunk_id in self._documents
+
+    def add(self, ids, documents):
+        """
+        Adds chunks to the index; chunks already indexed are skipped.
+
+        :param ids: Chunk IDs.
+        :param documents: Chunk Documents aligned with ``ids``.
+        """
+        with self._lock:
+            for chunk_id, document in zip(ids, documents):
+                if chunk_id in self._documents:
+                    continue
+                terms = Counter(tokenize(document.page_content))
+                self._documents[chunk_id] = (document.page_content, dict(document.metadata))
+                self._lengths[chunk_id] = sum(terms.values())
+                self._total_length += self._lengths[chunk_id]
+                for term, frequency in terms.items():
+                    self._postings.setdefault(term, {})[chunk_id] = frequency
+
+    def remove(self, ids):
+        """
+        Removes chunks from the index.
+
+        :param ids: Chunk IDs to remove.
+        """
+        with self._lock:
+            for chunk_id in ids:
+                entry = self._documents.pop(chunk_id, None)
+                if entry is None:
+                    continue
+                self._total_length -= self._lengths.pop(chunk_id)
+                for term in set(tokenize(entry[0])):
+                    postings = self._postings.get(term)
+                    if postings is not None:
+                        postings.pop(chunk_id, None)
+                        if not postings:
+                            del self._postings[term]
+
+    def search(self, query, k=4) -> list:
+        """
+        Ranks the indexed chunks against a keyword query with BM25.
+
+        :param query: The query string.
+        :param k: Number of results to return.
+        :return: A list of (Document, score) tuples, best match first.
+        """
+        with self._lock:
+            count = len(self._documents)
+            if not count:
+                return []
+            average_length = self._total_length / count
+            scores = Counter()
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / average_length)
+                    scores[chunk_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            results = []
+            for chunk_id, score in scores.most_common(k):
+                text, metadata = self._documents[chunk_id]
+                results.append((lc_documents.Document(page_content=text, metadata=dict(metadata)), score))
+            return results
+
+    def save(self, path):
+        """
+        Persists the indexed chunks to a JSON file; postings are rebuilt on load.
+
+        :param path: Destination path.
+        """
+        with self._lock:
+            data = {
+                "k1": self.k1,
+                "b": self.b,
+                "documents": {chunk_id: [text, metadata] for chunk_id, (text, metadata) in self._documents.items()},
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temporary, path)  # Readers never see a half-written index
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads an index saved with ``save``.
+
+        :param path: Path of the JSON file.
+        :return: The loaded BM25Index.
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(k1=data["k1"], b=data["b"])
+        ids = list(data["documents"])
+        documents = [
+            lc_documents.Document(page_content=text, metadata=metadata) for text, metadata in data["documents"].values()
+        ]
+        index.add(ids, documents)
+        return index
+
+def reciprocal_rank_fusion(rankings, k=4, rrf_k=60) -> list:
+    """
+    Merges ranked Document lists with reciprocal rank fusion, so chunks ranked well by both keyword
+    and vector retrieval come first.
+
+    :param rankings: Lists of Documents, each best match first.
+    :param k: Number of results to return.
+    :param rrf_k: Rank offset damping the influence of the top ranks.
+    :return: A list of (Document, score) tuples, best match first.
+    """
+    scores = Counter()
+    documents = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking):
+            key = (document.metadata.get("document_id"), document.page_content)
+            scores[key] += 1 / (rrf_k + rank + 1)
+            documents.setdefault(key, document)
+    return [(documents[key], score) for key, score in scores.most_common(k)]
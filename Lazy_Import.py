@@ -0,0 +1,38 @@
+import importlib
+
+class LazyModule:
+    def __init__(self, name):
+        """
+        Initializes a stand-in for a module that is imported on first attribute access, so modules can
+        reference heavy dependencies (Streamlit, Vertex AI) at top level without paying for them at import.
+
+        :param name: The module to import, e.g. "streamlit".
+        """
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)  # Thread-safe; cached in sys.modules
+            object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+def lazy_import(name) -> LazyModule:
+    """
+    Returns a lazily imported module.
+
+    :param name: The module to import on first use.
+    :return: A LazyModule standing in for the module.
+    """
+    return LazyModule(name)
@@ -1,18 +1,25 @@
 import streamlit as st
 import os
-import sys
 import json
 import time
-
-# Adjust the path to include the root directory of your project
-sys.path.append(os.path.abspath('../../'))
+import uuid
 
 # Import necessary classes from other tasks
 from Document_Processor import DocumentProcessor
-from Embedding_Client import EmbeddingClient
 from Chroma_Collection_Creator import ChromaCollectionCreator
-from Quiz_Generator import QuizGenerator
 from Quiz_Manager import QuizManager
+from Resource_Registry import get_embedding_client, get_quiz_job_queue
+
+def start_quiz(questions):
+    """
+    Initializes the session state for a new quiz from a question list or a running QuizJob.
+    """
+    st.session_state["quiz_manager"] = QuizManager(questions)
+    st.session_state["question_index"] = 0
+    st.session_state["current_selection"] = {}  # Track the current radio selection
+    st.session_state["answers"] = {}  # Store the user-selected answers
+    st.session_state["explanations"] = {}  # Store explanations for review
+    st.session_state["feedback"] = {}  # Store feedback (Correct/Incorrect)
 
 if __name__ == "__main__":
     # Embed config
@@ -25,47 +32,77 @@ if __name__ == "__main__":
     # Initialize Streamlit UI
     screen = st.empty()
 
+    persist_directory = "chroma_persistence_directory"
+
     # Only show the form if the quiz hasn't started
-    if "quiz_manager" not in st.session_state:
+    if "quiz_manager" not in st.session_state and "quiz_job_id" not in st.session_state:
         with screen.container():
             st.header("📝 PDF Quizify")
             st.write("Let AI transform your PDFs into accurate, engaging multiple-choice quizzes, ensuring every question stays true to your document!")
             st.markdown("<br>", unsafe_allow_html=True)
 
-            # Form to generate quiz
-            with st.form("Load Data to Chroma"):
-                st.subheader("⚡ Quiz Generator")
-                st.write("Choose your PDFs, define the quiz topic, and click Submit to generate your quiz instantly!")
-
-                processor = DocumentProcessor()
-                processor.ingest_documents()
-
-                embed_client = EmbeddingClient(**embed_config)
+            # Inputs live outside a form so generation can start before Submit is clicked
+            st.subheader("⚡ Quiz Generator")
+            st.write("Choose your PDFs and define the quiz topic; your quiz starts generating right away, so it's ready when you click Submit!")
 
-                topic_input = st.text_input("Topic for Generative Quiz", placeholder="Enter the topic of the document")
-                questions_count = st.slider("Number of Questions", min_value=1, max_value=10, value=1)
-                submitted = st.form_submit_button("Submit")
+            processor = DocumentProcessor()
+            processor.ingest_documents(stream=True)  # Pages are extracted while they are indexed
 
-                # Generate quiz questions
-                if submitted:
-                    persist_directory = "chroma_persistence_directory"
-                    chroma_creator = ChromaCollectionCreator(processor, embed_client, persist_directory=persist_directory)
+            embed_client = get_embedding_client(**embed_config)  # Shared across sessions
 
-                    if not chroma_creator.db:
-                        chroma_creator.create_chroma_collection()
-                        st.success("New Chroma collection successfully created!", icon="✅")
+            topic_input = st.text_input("Topic for Generative Quiz", placeholder="Enter the topic of the document")
+            questions_count = st.slider("Number of Questions", min_value=1, max_value=10, value=1)
 
-                    generator = QuizGenerator(topic_input, questions_count, chroma_creator)
-                    question_bank, raw_responses = generator.generate_quiz()
+            job = None
+            if processor.document_ids and topic_input:
+                chroma_creator = ChromaCollectionCreator(processor, embed_client, persist_directory=persist_directory)
 
-                    # Initialize session state for quiz
-                    st.session_state["quiz_manager"] = QuizManager(question_bank)
-                    st.session_state["question_index"] = 0
-                    st.session_state["current_selection"] = {}  # Track the current radio selection
-                    st.session_state["answers"] = {}  # Store the user-selected answers
-                    st.session_state["explanations"] = {}  # Store explanations for review
-                    st.session_state["feedback"] = {}  # Store feedback (Correct/Incorrect)
-                    screen.empty()  # Clear the screen completely once the quiz is generated
+                # Index each document set once per session; reruns reuse the collection
+                collection_name = chroma_creator.resolve_collection_name()
+                if st.session_state.get("indexed_collection") != collection_name:
+                    chroma_creator.create_chroma_collection(pages=processor.iter_pages(processor.files))
+                    st.session_state["indexed_collection"] = collection_name
+                else:
+                    chroma_creator.open_collection()
+
+                # Pre-generate in the background; jobs are shared between sessions, so a superseded job
+                # is only cancelled once no other session is waiting for it
+                session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+                job_queue = get_quiz_job_queue()
+                previous_job = job_queue.get(st.session_state.get("pending_job_id"))
+                job = job_queue.submit(
+                    topic_input, questions_count, chroma_creator, subscriber=session_id, speculative=True
+                )
+                if previous_job and previous_job is not job:
+                    job_queue.release(previous_job, session_id)
+                st.session_state["pending_job_id"] = job.id
+
+                progress = job.progress()
+                st.caption(f"Preparing your quiz: {progress['ready']} of {progress['total']} questions ready")
+
+            if st.button("Submit"):
+                if job is None:
+                    st.error("Upload a PDF and enter a topic first!", icon="🚨")
+                else:
+                    get_quiz_job_queue().promote(job)  # Runs ahead of other sessions' pre-generation
+                    st.session_state["quiz_job_id"] = job.id
+                    screen.empty()
+                    st.rerun()
+
+    # Poll the background job until its first question is ready; the rest arrive during the quiz
+    if "quiz_manager" not in st.session_state and "quiz_job_id" in st.session_state:
+        job = get_quiz_job_queue().get(st.session_state["quiz_job_id"])
+        if job is None or (job.done and not job.questions):
+            st.error(f"Quiz generation failed: {job.error if job else 'job not found'}", icon="🚨")
+            del st.session_state["quiz_job_id"]
+        elif job.questions:
+            start_quiz(job)
+            st.rerun()
+        else:
+            st.header("📝 PDF Quizify")
+            st.progress(0.0, text="Generating your first question...")
+            job.wait_for(1, timeout=1.0)
+            st.rerun()
 
     # Render the quiz UI if a quiz has been generated
     if "quiz_manager" in st.session_state:
@@ -82,6 +119,8 @@ if __name__ == "__main__":
         # Wrap the form logic inside the st.form context
         with st.form("Multiple Choice Question"):
             st.subheader(f"Question {question_index + 1}")
+            if not quiz_manager.is_complete:
+                st.caption(f"{quiz_manager.total_questions} of {quiz_manager.expected_total} questions ready; more are on the way!")
 
             # Display the question text
             st.write(f"Question: {current_question['question']}")
@@ -0,0 +1,402 @@
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+QUANTIZATIONS = (None, "float16", "int8")
+
+class NumpyVectorStore(VectorStore):
+    def __init__(self, collection_name="langchain", persist_directory=None, embedding_function=None, block_rows=65536,
+                 quantization=None, keep_full_precision=True, rescore_factor=4):
+        """
+        Initializes a lightweight in-process vector store that keeps row-normalized float32 embeddings in a
+        memory-mapped ``.npy`` file and answers top-k queries with matrix products. It mirrors the parts of
+        the Chroma interface used by ChromaCollectionCreator, so it can be used as its ``db``.
+
+        :param collection_name: Name of the collection; its files live in ``persist_directory/collection_name``.
+        :param persist_directory: Optional directory for persistence. Without it the store is in-memory only.
+        :param embedding_function: Embedding model with ``embed_query``/``embed_documents`` (e.g. EmbeddingClient).
+        :param block_rows: Number of rows multiplied at once, bounding the memory used by a query.
+        :param quantization: Optional compact storage for persisted embeddings: "float16" (half the size) or
+                             "int8" (a quarter, with one scale per row). Queries scan the compact copy.
+        :param keep_full_precision: Also keep the float32 embeddings on disk, so the top candidates of the
+                                    compact scan are rescored exactly. Disable to save disk space as well.
+        :param rescore_factor: With quantization and full precision kept, ``rescore_factor * k`` candidates
+                               are rescored at full precision.
+        """
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization: {quantization}. Choose from float16, int8.")
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        self.block_rows = block_rows
+        self.quantization = quantization
+        self.keep_full_precision = keep_full_precision or not quantization
+        self.rescore_factor = rescore_factor
+
+        self._lock = threading.Lock()
+        self._vectors = None   # Persisted float32 embeddings, memory-mapped read-only
+        self._codes = None     # Persisted quantized embeddings, memory-mapped read-only
+        self._scales = None    # Per-row scales of int8 codes
+        self._persisted = 0    # Number of persisted rows
+        self._pending = []     # Embeddings added since the last persist()
+        self._ids = []
+        self._texts = []
+        self._metadatas = []
+        self._rows = {}        # ID -> row
+        self._alive = np.zeros(0, dtype=bool)  # Rows not deleted since the last persist()
+
+        if self.path and os.path.exists(os.path.join(self.path, "documents.json")):
+            self._load()
+
+    @property
+    def path(self):
+        if not self.persist_directory:
+            return None
+        return os.path.join(self.persist_directory, self.collection_name)
+
+    @property
+    def embeddings(self):
+        return self.embedding_function
+
+    def _load(self):
+        with open(os.path.join(self.path, "documents.json"), encoding="utf-8") as f:
+            data = json.load(f)
+        self._ids, self._texts, self._metadatas = data["ids"], data["texts"], data["metadatas"]
+        self._rows = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+        self._alive = np.ones(len(self._ids), dtype=bool)
+        self._persisted = len(self._ids)
+        self._vectors = self._codes = self._scales = None
+        if not self._ids:
+            return
+        # Zero-copy: pages are read from disk on first access
+        for name in ("float16", "int8"):
+            path = os.path.join(self.path, f"embeddings.{name}.npy")
+            if os.path.exists(path):
+                self._codes = np.load(path, mmap_mode="r")
+                if name == "int8":
+                    self._scales = np.load(os.path.join(self.path, "scales.npy"))
+        path = os.path.join(self.path, "embeddings.npy")
+        if os.path.exists(path):
+            self._vectors = np.load(path, mmap_mode="r")
+
+    def _blocks(self):
+        """
+        Yields (first row, block, scales) triples covering every stored embedding, using the compact
+        copy of persisted embeddings when there is one. ``scales`` is None unless the block is int8.
+        """
+        persisted = self._codes if self._codes is not None else self._vectors
+        if persisted is not None:
+            for start in range(0, self._persisted, self.block_rows):
+                scales = self._scales[start:start + self.block_rows] if self._scales is not None else None
+                yield start, persisted[start:start + self.block_rows], scales
+        offset = self._persisted
+        for block in self._pending:
+            yield offset, block, None
+            offset += block.shape[0]
+
+    def _full_rows(self, rows):
+        """
+        Returns the float32 embeddings of sorted rows, dequantizing if full precision was not kept.
+        """
+        vectors = np.zeros((len(rows), self._dimensions()), dtype=np.float32)
+        rows = np.asarray(rows, dtype=np.int64)
+        persisted = rows < self._persisted
+        if persisted.any():
+            if self._vectors is not None:
+                vectors[persisted] = self._vectors[rows[persisted]]
+            else:
+                vectors[persisted] = self._dequantize(self._codes[rows[persisted]], self._scales_of(rows[persisted]))
+        offset = self._persisted
+        for block in self._pending:
+            inside = (rows >= offset) & (rows < offset + block.shape[0])
+            vectors[inside] = block[rows[inside] - offset]
+            offset += block.shape[0]
+        return vectors
+
+    def _dimensions(self) -> int:
+        for source in (self._vectors, self._codes):
+            if source is not None:
+                return source.shape[1]
+        return self._pending[0].shape[1] if self._pending else 0
+
+    def _scales_of(self, rows):
+        return self._scales[rows] if self._scales is not None else None
+
+    @staticmethod
+    def _dequantize(block, scales):
+        block = np.asarray(block).astype(np.float32, copy=False)
+        return block * scales[:, None] if scales is not None else block
+
+    @staticmethod
+    def quantize(vectors, quantization):
+        """
+        Quantizes float32 vectors.
+
+        :param vectors: The vectors to quantize.
+        :param quantization: "float16" or "int8".
+        :return: A tuple of (codes, per-row scales or None).
+        """
+        if quantization == "float16":
+            return vectors.astype(np.float16), None
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs) -> list:
+        """
+        Embeds and adds texts; texts whose ID is already stored replace the stored version.
+
+        :param texts: The texts to add.
+        :param metadatas: Optional metadata dictionaries aligned with ``texts``.
+        :param ids: Optional IDs aligned with ``texts``. Random IDs are generated when omitted.
+        :return: The IDs of the added texts.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = list(metadatas) if metadatas else [{} for _ in texts]
+        ids = list(ids) if ids else [uuid.uuid4().hex for _ in texts]
+        vectors = self._normalize(self.embedding_function.embed_documents(texts))
+
+        with self._lock:
+            self.delete(ids=[chunk_id for chunk_id in ids if chunk_id in self._rows], _locked=True)
+            for chunk_id, text, metadata in zip(ids, texts, metadatas):
+                self._rows[chunk_id] = len(self._ids)
+                self._ids.append(chunk_id)
+                self._texts.append(text)
+                self._metadatas.append(dict(metadata))
+            self._pending.append(vectors)
+            self._alive = np.concatenate([self._alive, np.ones(len(texts), dtype=bool)])
+        return ids
+
+    def delete(self, ids=None, _locked=False, **kwargs):
+        """
+        Deletes entries by ID. Rows are masked out immediately and dropped from disk on persist().
+
+        :param ids: IDs to delete.
+        """
+        if not _locked:
+            with self._lock:
+                return self.delete(ids, _locked=True)
+        for chunk_id in ids or []:
+            row = self._rows.pop(chunk_id, None)
+            if row is not None:
+                self._alive[row] = False
+        return True
+
+    @staticmethod
+    def _matches(metadata, where) -> bool:
+        for key, condition in (where or {}).items():
+            value = metadata.get(key)
+            if isinstance(condition, dict):
+                if "$in" in condition and value not in condition["$in"]:
+                    return False
+                if "$nin" in condition and value in condition["$nin"]:
+                    return False
+                if "$eq" in condition and value != condition["$eq"]:
+                    return False
+                if "$ne" in condition and value == condition["$ne"]:
+                    return False
+            elif value != condition:
+                return False
+        return True
+
+    def get(self, ids=None, where=None, limit=None, include=("documents", "metadatas"), **kwargs) -> dict:
+        """
+        Looks up stored entries by ID and/or metadata filter, like ``Chroma.get``.
+
+        :param ids: Optional IDs to look up.
+        :param where: Optional metadata filter supporting equality, $eq, $ne, $in and $nin.
+        :param limit: Optional maximum number of entries.
+        :param include: Fields to return besides the IDs: "documents" and/or "metadatas".
+        :return: A dictionary with "ids" and the included fields.
+        """
+        with self._lock:
+            rows = [self._rows[chunk_id] for chunk_id in ids if chunk_id in self._rows] if ids is not None else \
+                sorted(self._rows.values())
+            rows = [row for row in rows if self._matches(self._metadatas[row], where)]
+            if limit is not None:
+                rows = rows[:limit]
+            result = {"ids": [self._ids[row] for row in rows]}
+            if "documents" in include:
+                result["documents"] = [self._texts[row] for row in rows]
+            if "metadatas" in include:
+                result["metadatas"] = [self._metadatas[row] for row in rows]
+            return result
+
+    def batch_similarity_search_by_vector(self, embeddings, k=4) -> list:
+        """
+        Finds the top-k entries for several query embeddings with one matrix product per block.
+
+        :param embeddings: Query embeddings.
+        :param k: Number of results per query.
+        :return: For each query, a list of (row, cosine similarity) pairs, best match first.
+        """
+        queries = self._normalize(np.atleast_2d(embeddings))
+        with self._lock:
+            blocks = list(self._blocks())
+            alive = self._alive
+            rescore = self._codes is not None and self._vectors is not None and self.rescore_factor > 1
+        candidates = k * self.rescore_factor if rescore else k
+
+        best_rows = np.zeros((queries.shape[0], 0), dtype=np.int64)
+        best_scores = np.zeros((queries.shape[0], 0), dtype=np.float32)
+        for start, block, scales in blocks:
+            scores = queries @ np.asarray(block).astype(np.float32, copy=False).T
+            if scales is not None:
+                scores *= scales
+            scores[:, ~alive[start:start + block.shape[0]]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, start + block.shape[0]), scores.shape)
+            # Keep only the running top candidates across blocks
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            if scores.shape[1] > candidates:
+                top = np.argpartition(-scores, candidates - 1, axis=1)[:, :candidates]
+                scores = np.take_along_axis(scores, top, axis=1)
+                rows = np.take_along_axis(rows, top, axis=1)
+            best_scores, best_rows = scores, rows
+
+        results = []
+        for query, query_rows, query_scores in zip(queries, best_rows, best_scores):
+            valid = np.isfinite(query_scores)
+            query_rows, query_scores = query_rows[valid], query_scores[valid]
+            if rescore and len(query_rows):
+                # Exact scores for the compact scan's candidates, read from the full-precision file
+                order = np.argsort(query_rows)
+                query_rows = query_rows[order]
+                with self._lock:
+                    query_scores = self._full_rows(query_rows) @ query
+            order = np.argsort(-query_scores)[:k]
+            results.append([(int(query_rows[i]), float(query_scores[i])) for i in order])
+        return results
+
+    def _document(self, row) -> Document:
+        return Document(page_content=self._texts[row], metadata=dict(self._metadatas[row]))
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4) -> list:
+        """
+        Finds the top-k entries for a query embedding.
+
+        :param embedding: The query embedding.
+        :param k: Number of results.
+        :return: A list of (Document, cosine similarity) tuples, best match first.
+        """
+        return [(self._document(row), score) for row, score in self.batch_similarity_search_by_vector([embedding], k)[0]]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs) -> list:
+        return self.similarity_search_by_vector_with_score(self.embedding_function.embed_query(query), k)
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs) -> list:
+        return [document for document, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search(self, query, k=4, **kwargs) -> list:
+        """
+        Finds the entries most similar to a query.
+
+        :param query: The query string.
+        :param k: Number of results.
+        :return: A list of Documents, best match first.
+        """
+        return [document for document, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        # Cosine similarity in [-1, 1] mapped to a relevance score in [0, 1]
+        return lambda score: min(1.0, max(0.0, (score + 1.0) / 2.0))
+
+    def max_marginal_relevance_search(self, query, k=4, fetch_k=20, lambda_mult=0.5, **kwargs) -> list:
+        """
+        Selects k diverse entries among the fetch_k most similar to the query.
+
+        :param query: The query string.
+        :param k: Number of results.
+        :param fetch_k: Number of candidates to select from.
+        :param lambda_mult: Trade-off between relevance (1.0) and diversity (0.0).
+        :return: A list of Documents.
+        """
+        query_vector = self._normalize(self.embedding_function.embed_query(query))
+        candidates = self.batch_similarity_search_by_vector([query_vector], max(k, fetch_k))[0]
+        if not candidates:
+            return []
+        # Candidates stay in relevance order; only the row lookup runs in row order
+        rows = np.array([row for row, _ in candidates], dtype=np.int64)
+        order = np.argsort(rows)
+        with self._lock:
+            lookup = self._full_rows(rows[order])
+        vectors = np.empty_like(lookup)
+        vectors[order] = lookup
+        relevance = np.array([score for _, score in candidates], dtype=np.float32)
+
+        selected = [int(np.argmax(relevance))]
+        while len(selected) < min(k, len(candidates)):
+            redundancy = np.max(vectors @ vectors[selected].T, axis=1)
+            scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+            scores[selected] = -np.inf
+            selected.append(int(np.argmax(scores)))
+        return [self._document(candidates[i][0]) for i in selected]
+
+    def persist(self):
+        """
+        Writes the live entries to disk, dropping deleted rows, and re-opens the embeddings memory-mapped.
+        Embeddings are written in full precision and/or the configured compact format.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            rows = np.flatnonzero(self._alive)
+            vectors = self._full_rows(rows)
+
+            os.makedirs(self.path, exist_ok=True)
+            arrays = {}  # File name -> array
+            if self.keep_full_precision:
+                arrays["embeddings.npy"] = vectors
+            if self.quantization:
+                codes, scales = self.quantize(vectors, self.quantization)
+                arrays[f"embeddings.{self.quantization}.npy"] = codes
+                if scales is not None:
+                    arrays["scales.npy"] = scales
+            documents_path = os.path.join(self.path, "documents.json")
+            # Write to temporary files first so readers never see a half-written collection
+            for name, array in arrays.items():
+                with open(os.path.join(self.path, f"{name}.tmp"), "wb") as f:
+                    np.save(f, array)
+            data = {
+                "ids": [self._ids[row] for row in rows],
+                "texts": [self._texts[row] for row in rows],
+                "metadatas": [self._metadatas[row] for row in rows],
+            }
+            with open(f"{documents_path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            self._vectors = self._codes = None  # Release the old mappings before replacing their files
+            for name in ("embeddings.npy", "embeddings.float16.npy", "embeddings.int8.npy", "scales.npy"):
+                path = os.path.join(self.path, name)
+                if name in arrays:
+                    os.replace(f"{path}.tmp", path)
+                elif os.path.exists(path):
+                    os.remove(path)  # Stale format from an earlier configuration
+            os.replace(f"{documents_path}.tmp", documents_path)
+
+            self._pending = []
+            self._load()
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, collection_name="langchain",
+                   persist_directory=None, **kwargs):
+        """
+        Creates a store from texts.
+        """
+        store = cls(collection_name=collection_name, persist_directory=persist_directory, embedding_function=embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
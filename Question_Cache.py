@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+# Kept next to the persisted collections rather than in the working directory
+DEFAULT_PATH = os.path.join("chroma_persistence_directory", "question_cache.sqlite")
+
+class QuestionCache:
+    def __init__(self, path=DEFAULT_PATH, ttl=7 * 24 * 3600, max_questions=100000):
+        """
+        Initializes a persistent bank of validated quiz questions stored in SQLite, keyed by document
+        set, topic, model and prompt version.
+
+        :param path: Path of the SQLite database file.
+        :param ttl: Seconds a question stays servable after it was generated. None keeps questions forever.
+        :param max_questions: Maximum number of stored questions before the least recently served ones
+                              are evicted.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_questions = max_questions
+
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, cache_key TEXT NOT NULL, question_text TEXT NOT NULL, "
+            "question_json TEXT NOT NULL, created REAL NOT NULL, last_access REAL NOT NULL, "
+            "UNIQUE (cache_key, question_text))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS questions_key ON questions (cache_key)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS questions_last_access ON questions (last_access)")
+        self._conn.commit()
+
+        # Counters exposed through stats()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize_topic(topic) -> str:
+        """
+        Normalizes a topic so trivially different spellings share cached questions.
+        """
+        return " ".join(topic.lower().split())
+
+    @classmethod
+    def make_key(cls, document_set, topic, model_name, prompt_version) -> str:
+        """
+        Builds the cache key of a question pool.
+
+        :param document_set: Fingerprint of the quiz's document set (e.g. its collection name).
+        :param topic: The quiz topic.
+        :param model_name: Name of the generating model.
+        :param prompt_version: Version of the generation prompt.
+        :return: The hex digest identifying the pool.
+        """
+        parts = [document_set, cls.normalize_topic(topic), model_name, str(prompt_version)]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, cache_key, limit=None, shuffle=True) -> list:
+        """
+        Returns unexpired questions of a pool, in random order so repeated quizzes vary, and marks them as served.
+
+        :param cache_key: The pool's cache key.
+        :param limit: Optional maximum number of questions to return.
+        :param shuffle: Return the questions in random order.
+        :return: A list of question dictionaries.
+        """
+        questions = []
+        for question in self.iter_pool(cache_key, shuffle=shuffle):
+            if limit is not None and len(questions) >= limit:
+                break
+            questions.append(question)
+        self.mark_served(cache_key, questions)
+        return questions
+
+    def iter_pool(self, cache_key, page_size=20, shuffle=True):
+        """
+        Yields the unexpired questions of a pool without marking them as served. Only the row IDs are
+        read up front; the questions are loaded in pages as the caller consumes them.
+
+        :param cache_key: The pool's cache key.
+        :param page_size: Number of questions loaded per query.
+        :param shuffle: Yield the questions in random order.
+        :return: A generator of question dictionaries.
+        """
+        query = "SELECT id FROM questions WHERE cache_key = ?"
+        params = [cache_key]
+        if self.ttl:
+            query += " AND created >= ?"
+            params.append(time.time() - self.ttl)
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(query, params)]
+        if shuffle:
+            random.shuffle(ids)
+
+        for start in range(0, len(ids), page_size):
+            page = ids[start:start + page_size]
+            with self._lock:
+                rows = dict(self._conn.execute(
+                    f"SELECT id, question_json FROM questions WHERE id IN ({', '.join('?' * len(page))})", page
+                ))
+            for row_id in page:
+                if row_id in rows:  # Skips questions evicted meanwhile
+                    yield json.loads(rows[row_id])
+
+    def mark_served(self, cache_key, questions):
+        """
+        Records that questions of a pool were served, refreshing their last access for LRU eviction
+        and counting them as hits. Serving no question counts as a miss.
+
+        :param cache_key: The pool's cache key.
+        :param questions: The question dictionaries actually served.
+        """
+        now = time.time()
+        with self._lock:
+            if questions:
+                self._conn.executemany(
+                    "UPDATE questions SET last_access = ? WHERE cache_key = ? AND question_text = ?",
+                    [(now, cache_key, question["question"]) for question in questions]
+                )
+                self._conn.commit()
+            self.hits += len(questions)
+            if not questions:
+                self.misses += 1
+
+    def put(self, cache_key, questions):
+        """
+        Stores validated questions in a pool, then drops expired questions and evicts least recently
+        used ones beyond ``max_questions``.
+
+        :param cache_key: The pool's cache key.
+        :param questions: The question dictionaries to store.
+        """
+        now = time.time()
+        rows = [(cache_key, question["question"], json.dumps(question), now, now) for question in questions]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO questions (cache_key, question_text, question_json, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?)", rows
+            )
+            if self.ttl:
+                self._conn.execute("DELETE FROM questions WHERE created < ?", (now - self.ttl,))
+            excess = self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0] - self.max_questions
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM questions WHERE id IN (SELECT id FROM questions ORDER BY last_access LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        :return: A dictionary with hit, miss, eviction and size counters.
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "questions": size}
+
+    def close(self):
+        """
+        Closes the underlying SQLite connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+_question_caches = {}
+_question_caches_lock = threading.Lock()
+
+def get_question_cache(path=DEFAULT_PATH, **kwargs) -> QuestionCache:
+    """
+    Returns the process-wide question cache for a database path, creating it on first use.
+
+    :param path: Path of the SQLite database file.
+    :param kwargs: QuestionCache arguments used when the cache is first created.
+    :return: The shared QuestionCache instance.
+    """
+    path = os.path.abspath(path)
+    with _question_caches_lock:
+        if path not in _question_caches:
+            _question_caches[path] = QuestionCache(path, **kwargs)
+        return _question_caches[path]
@@ -0,0 +1,154 @@
+import json
+import re
+
+from Lazy_Import import lazy_import
+
+np = lazy_import("numpy")  # Only needed once an embedding model is attached
+
+class QuestionSimilarityIndex:
+    def __init__(self, embed_model=None, threshold=0.92, initial_capacity=256):
+        """
+        Initializes a similarity index over question embeddings, held as a row-normalized float32
+        matrix so a near-duplicate check is one matrix-vector product.
+
+        :param embed_model: Optional embedding model with ``embed_query``/``embed_documents`` (e.g. EmbeddingClient).
+                            Without one, only exact duplicates (ignoring case and punctuation) are detected.
+        :param threshold: Cosine similarity at or above which two questions are considered duplicates.
+        :param initial_capacity: Initial number of rows allocated for the matrix.
+        """
+        self.embed_model = embed_model
+        self.threshold = threshold
+        self.initial_capacity = initial_capacity
+        self.questions = []           # Indexed question texts
+        self._normalized = set()      # Normalized texts for exact matching
+        self._matrix = None           # Row-normalized embeddings of the questions that have one, grown by doubling
+        self._size = 0                # Number of rows in use
+        self._last_checked = None     # (text, normalized vector) of the last question checked, reused by add
+
+    def __len__(self):
+        return len(self.questions)
+
+    @staticmethod
+    def normalize_text(text) -> str:
+        """
+        Normalizes a question for exact matching: lower case, punctuation and extra spaces removed.
+        """
+        return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+    def _embed(self, text):
+        """
+        Embeds and normalizes a question text, or returns None if no embedding is available.
+        """
+        # Only the last check is kept: a question is added right after it passes, and rejected ones are dropped
+        if self._last_checked is not None and self._last_checked[0] == text:
+            return self._last_checked[1]
+        if not self.embed_model:
+            return None
+        try:
+            vector = np.asarray(self.embed_model.embed_query(text), dtype=np.float32)
+        except Exception as e:
+            print(f"Question embedding failed, falling back to exact matching: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        vector = vector / norm if norm else vector
+        self._last_checked = (text, vector)
+        return vector
+
+    def max_similarity(self, vector) -> float:
+        """
+        Computes the highest cosine similarity between a normalized vector and the indexed questions.
+
+        :param vector: A normalized embedding.
+        :return: The highest similarity, or -1.0 if the index has no embeddings.
+        """
+        if self._size == 0:
+            return -1.0
+        return float(np.max(self._matrix[:self._size] @ vector))
+
+    def is_duplicate(self, text) -> bool:
+        """
+        Checks whether a question is an exact or near duplicate of an indexed question.
+
+        :param text: The question text.
+        :return: True if the question should be rejected as a duplicate.
+        """
+        if self.normalize_text(text) in self._normalized:
+            return True
+        if self._size == 0:
+            return False
+        vector = self._embed(text)
+        return vector is not None and self.max_similarity(vector) >= self.threshold
+
+    def add(self, text, vector=None):
+        """
+        Adds a question to the index.
+
+        :param text: The question text.
+        :param vector: Optional precomputed embedding; otherwise it is computed with the embed model.
+        """
+        self.questions.append(text)
+        self._normalized.add(self.normalize_text(text))
+
+        if vector is not None:
+            vector = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            vector = vector / norm if norm else vector
+        else:
+            vector = self._embed(text)
+        self._last_checked = None
+        if vector is None:
+            return
+
+        if self._matrix is None:
+            self._matrix = np.zeros((self.initial_capacity, vector.shape[0]), dtype=np.float32)
+        elif self._size == self._matrix.shape[0]:
+            # Double the capacity so appends stay amortized O(1)
+            grown = np.zeros((self._matrix.shape[0] * 2, self._matrix.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[self._size] = vector
+        self._size += 1
+
+    def add_many(self, texts):
+        """
+        Adds several questions, embedding them in one batch.
+
+        :param texts: The question texts.
+        """
+        vectors = [None] * len(texts)
+        if self.embed_model and texts:
+            try:
+                vectors = self.embed_model.embed_documents(list(texts)) or vectors
+            except Exception as e:
+                print(f"Question embedding failed, falling back to exact matching: {e}")
+        for text, vector in zip(texts, vectors):
+            self.add(text, vector)
+
+    def save(self, path):
+        """
+        Persists the index to a ``.npz`` file.
+
+        :param path: Destination path.
+        """
+        matrix = self._matrix[:self._size] if self._size else np.zeros((0, 0), dtype=np.float32)
+        np.savez(path, matrix=matrix, questions=json.dumps(self.questions), threshold=self.threshold)
+
+    @classmethod
+    def load(cls, path, embed_model=None, threshold=None):
+        """
+        Loads an index saved with ``save``.
+
+        :param path: Path of the ``.npz`` file.
+        :param embed_model: Optional embedding model for new questions.
+        :param threshold: Optional threshold overriding the saved one.
+        :return: The loaded QuestionSimilarityIndex.
+        """
+        data = np.load(path)
+        index = cls(embed_model, float(data["threshold"]) if threshold is None else threshold)
+        index.questions = json.loads(str(data["questions"]))
+        index._normalized = {cls.normalize_text(text) for text in index.questions}
+        matrix = data["matrix"]
+        if matrix.size:
+            index._matrix = np.array(matrix, dtype=np.float32)
+            index._size = matrix.shape[0]
+        return index
@@ -0,0 +1,75 @@
+import json
+
+from langchain_core.output_parsers import BaseOutputParser
+
+class QuestionListOutputParser(BaseOutputParser):
+    """
+    List-aware counterpart of StructuredOutputParser: parses a JSON list of objects that follow
+    the given response schemas. Items that are malformed or incomplete are dropped one by one
+    instead of failing the whole response.
+    """
+    response_schemas: list
+
+    def get_format_instructions(self) -> str:
+        """
+        Builds format instructions asking for a JSON list of objects matching the response schemas.
+
+        :return: The format instructions to include in the prompt.
+        """
+        fields = "\n".join(
+            f'\t\t"{schema.name}": {schema.type}  // {schema.description}'
+            for schema in self.response_schemas
+        )
+        return (
+            "The output should be a markdown code snippet containing a JSON list of objects, "
+            "each formatted in the following schema, including the leading and trailing "
+            "\"```json\" and \"```\":\n\n"
+            f"```json\n[\n\t{{\n{fields}\n\t}}\n]\n```"
+        )
+
+    def parse(self, text: str) -> list:
+        """
+        Parses the LLM output into a list of question dictionaries, salvaging valid items
+        from a partially malformed list.
+
+        :param text: The raw LLM output.
+        :return: A list of parsed items; empty if nothing could be salvaged.
+        """
+        start, end = text.find("["), text.rfind("]")
+        if start != -1 and end > start:
+            try:
+                items = json.loads(text[start:end + 1])
+                if isinstance(items, list):
+                    return [item for item in items if self.is_complete(item)]
+            except json.JSONDecodeError:
+                pass
+
+        # Salvage: decode each object that still parses on its own
+        decoder = json.JSONDecoder()
+        items = []
+        index = text.find("{")
+        while index != -1:
+            try:
+                item, end_index = decoder.raw_decode(text, index)
+            except json.JSONDecodeError:
+                index = text.find("{", index + 1)
+                continue
+            if self.is_complete(item):
+                items.append(item)
+                index = text.find("{", end_index)
+            else:
+                index = text.find("{", index + 1)
+        return items
+
+    def is_complete(self, item) -> bool:
+        """
+        Checks that an item is a dictionary with every schema field present.
+
+        :param item: A decoded JSON value.
+        :return: True if the item has all required fields.
+        """
+        return isinstance(item, dict) and all(item.get(schema.name) for schema in self.response_schemas)
+
+    @property
+    def _type(self) -> str:
+        return "question_list"
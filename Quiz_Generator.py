@@ -1,22 +1,43 @@
-import streamlit as st
-import os
-import sys
 import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
-# Adjust the path to include the root directory of your project
-sys.path.append(os.path.abspath('../../'))
+from Lazy_Import import lazy_import
 
 # Import necessary classes from other tasks
-from Document_Processor import DocumentProcessor
-from Embedding_Client import EmbeddingClient
-from Chroma_Collection_Creator import ChromaCollectionCreator
-from langchain.output_parsers import ResponseSchema, StructuredOutputParser
-from langchain_core.prompts import PromptTemplate
-from langchain_google_vertexai import VertexAI
+from Rate_Limiter import get_rate_limiter, estimate_tokens
+from Question_Index import QuestionSimilarityIndex
+from Context_Planner import ContextPlanner
+from Question_Cache import QuestionCache, get_question_cache
+from Json_Stream_Parser import IncrementalJSONParser
+
+# Heavy dependencies load on first use
+st = lazy_import("streamlit")
+vertexai = lazy_import("langchain_google_vertexai")
+output_parsers = lazy_import("langchain.output_parsers")
+prompts = lazy_import("langchain_core.prompts")
+question_list_parser = lazy_import("Question_List_Parser")  # Subclasses a langchain_core parser
+
+# Bump when the prompts or the question schema change, so cached questions from older prompts are not served
+PROMPT_VERSION = "1"
+
+class RequestAbandoned(Exception):
+    """Raised on a worker thread when its request was abandoned before the LLM was called."""
+
+class QuestionRequest:
+    def __init__(self):
+        """
+        Initializes the state of one question request shared between generate_quiz and its worker thread.
+        """
+        self.started = None                  # When the current LLM call began; None while waiting for quota
+        self.abandoned = threading.Event()   # Set once generate_quiz stops waiting for the request
 
 class QuizGenerator:
-    def __init__(self, topic=None, num_questions=1, vectorstore=None):
+    def __init__(self, topic=None, num_questions=1, vectorstore=None, llm=None,
+                 max_workers=4, request_timeout=60, max_retries=10, rate_limiter=None, batch_size=1,
+                 similarity_threshold=0.92, question_index=None, context_pool_size=20, service=None,
+                 question_cache=None, stream=False, retrieval_mode=None):
         """
         Initializes the QuizGenerator with a required topic, the number of questions for the quiz,
         and an optional vectorstore for querying related information.
@@ -24,6 +45,24 @@ class QuizGenerator:
         :param topic: The topic for the quiz. Defaults to "General Knowledge" if not provided.
         :param num_questions: Number of questions for the quiz. Cannot exceed 10.
         :param vectorstore: Optional vectorstore for querying related information.
+        :param llm: Optional pre-built LLM (e.g. a local fake LLM for testing). Defaults to Gemini.
+        :param max_workers: Maximum number of question requests kept in flight at once.
+        :param request_timeout: Seconds to wait for a single question request before giving up on it.
+        :param max_retries: Maximum attempts per question before the quiz is returned short.
+        :param rate_limiter: Optional RateLimiter. Defaults to the shared Gemini quota limiter.
+        :param batch_size: Number of questions requested per LLM call. 1 uses the single-question prompt.
+        :param similarity_threshold: Cosine similarity of question embeddings above which a question is
+                                     rejected as a near-duplicate.
+        :param question_index: Optional QuestionSimilarityIndex shared across quizzes (e.g. loaded from a
+                               persisted question bank). Defaults to a fresh index per quiz.
+        :param context_pool_size: Number of chunks retrieved once per quiz and shared out across questions.
+        :param service: Optional QuizGeneratorService providing a shared LLM client and compiled chains.
+        :param question_cache: Optional QuestionCache of validated questions. Defaults to the shared cache;
+                               pass False to always generate fresh questions.
+        :param stream: Stream responses and parse them incrementally, so malformed output is abandoned
+                       as soon as it is detected instead of after the full response.
+        :param retrieval_mode: Context retrieval mode, "vector", "keyword" or "hybrid". Defaults to hybrid
+                               when the vectorstore has a keyword index and to vector otherwise.
         """
         if not topic:
             self.topic = "General Knowledge"
@@ -34,20 +73,52 @@ class QuizGenerator:
             raise ValueError("Number of questions cannot exceed 10.")
         self.num_questions = num_questions
 
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.max_workers = max_workers
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.batch_size = batch_size
+        self.rate_limiter = rate_limiter or get_rate_limiter(
+            "gemini", requests_per_minute=60, tokens_per_minute=1000000
+        )
+
         self.vectorstore = vectorstore
-        self.llm = None
+        self.context_pool_size = context_pool_size
+        self.retrieval_mode = retrieval_mode
+        self.context_planner = None  # Retrieves context once per quiz
+        self._planner_lock = threading.Lock()
+        self.llm = llm
+        self.max_output_tokens = 500 * batch_size  # Room for one question per batch item
+        self.service = service
+        self.stream = stream
+        self.model_name = service.model_name if service else "gemini-1.5-flash"
+        self.question_cache = get_question_cache() if question_cache is None else question_cache
+        self.chains = {}  # Compiled chains, built once per generator unless shared by a service
+        self._local = threading.local()  # The QuestionRequest run by the current worker thread
         self.question_bank = []  # Initialize the question bank to store questions
+        self.similarity_threshold = similarity_threshold
+        self.shared_question_index = question_index
+        self.question_index = question_index if question_index is not None else self.new_question_index()
 
         self.response_schemas = [
-            ResponseSchema(name="question", description="The quiz question."),
-            ResponseSchema(name="choices", description="List of multiple choice options with keys."),
-            ResponseSchema(name="answer", description="The correct answer from the choices."),
-            ResponseSchema(name="explanation", description="Explanation of the correct answer.")
+            output_parsers.ResponseSchema(name="question", description="The quiz question."),
+            output_parsers.ResponseSchema(name="choices", description="List of multiple choice options with keys."),
+            output_parsers.ResponseSchema(name="answer", description="The correct answer from the choices."),
+            output_parsers.ResponseSchema(name="explanation", description="Explanation of the correct answer.")
         ]
 
-        self.output_parser = StructuredOutputParser.from_response_schemas(self.response_schemas)
+        self.output_parser = output_parsers.StructuredOutputParser.from_response_schemas(self.response_schemas)
         self.format_instructions = self.output_parser.get_format_instructions()
 
+        # List-aware parser for batch mode
+        self.list_output_parser = question_list_parser.QuestionListOutputParser(
+            response_schemas=self.response_schemas
+        )
+        self.list_format_instructions = self.list_output_parser.get_format_instructions()
+
         self.prompt_template = """
             You are a subject matter expert on the topic: {topic}
 
@@ -72,14 +143,41 @@ class QuizGenerator:
             Context: {context}
         """
 
+        self.batch_prompt_template = """
+            You are a subject matter expert on the topic: {topic}
+
+            Follow the instructions to create {count} different quiz questions:
+            1. Generate {count} distinct questions based on the topic provided.
+            2. Provide 4 multiple choice answers for each question.
+            3. Specify the correct answer for each question.
+            4. Explain why each correct answer is right.
+
+            {format_instructions}
+
+            The choices of each question must be returned in this format:
+            [
+                {{"key": "A", "value": "<choice A>"}},
+                {{"key": "B", "value": "<choice B>"}},
+                {{"key": "C", "value": "<choice C>"}},
+                {{"key": "D", "value": "<choice D>"}}
+            ]
+
+            Each answer must refer to the key from its choices list.
+
+            Context: {context}
+        """
+
     def init_llm(self):
         """
         Initializes and configures the Large Language Model (LLM) for generating quiz questions.
         """
-        self.llm = VertexAI(
-            model_name="gemini-1.5-flash",
+        if self.service:
+            self.llm = self.service.get_llm(self.max_output_tokens)
+            return
+        self.llm = vertexai.VertexAI(
+            model_name=self.model_name,
             temperature=1.0,
-            max_output_tokens=500
+            max_output_tokens=self.max_output_tokens
         )
         
     def generate_question_with_vectorstore(self):
@@ -88,76 +186,483 @@ class QuizGenerator:
         
         :return: The generated quiz question.
         """
-        if not self.llm:
-            self.init_llm()
         if not self.vectorstore:
             raise ValueError("Vectorstore not provided.")
 
-        from langchain_core.runnables import RunnablePassthrough, RunnableParallel
-
-        retriever = self.vectorstore.db.as_retriever()
+        # Each request gets its own slice of the quiz's retrieved context
+        context = ContextPlanner.format_context(self.get_context_planner().next_context())
+        chain = self.get_chain("single")
 
-        prompt = PromptTemplate(
-            template=self.prompt_template,
-            input_variables=["topic", "context"],
-            partial_variables={"format_instructions": self.format_instructions}
+        # Wait for quota instead of sleeping blindly; back off only on real quota errors
+        response = self.call_llm(
+            chain.invoke, {"topic": self.topic, "context": context}, tokens=self.estimate_request_tokens(context)
         )
+        
+        return response
+
+    def generate_questions_batch(self, count):
+        """
+        Generates several quiz questions in a single LLM call using the batch prompt.
+
+        :param count: Number of questions to request.
+        :return: The list of questions that could be parsed from the response.
+        """
+        if not self.vectorstore:
+            raise ValueError("Vectorstore not provided.")
 
-        setup_and_retrieval = RunnableParallel(
-            {"context": retriever, "topic": RunnablePassthrough()}
+        context = ContextPlanner.format_context(self.get_context_planner().next_context(count))
+        chain = self.get_chain("batch")
+
+        return self.call_llm(
+            chain.invoke,
+            {"topic": self.topic, "context": context, "count": str(count)},
+            tokens=self.estimate_request_tokens(context)
         )
-        chain = setup_and_retrieval | prompt | self.llm | self.output_parser
 
-        response = chain.invoke(self.topic)
-        
-        return response
+    def stream_questions(self, count=1, on_partial=None) -> list:
+        """
+        Generates questions from a streamed response that is parsed as it arrives. The stream is
+        abandoned as soon as it stops being valid JSON of the question schema, and reading stops as
+        soon as the JSON is complete.
+
+        :param count: Number of questions to request; above 1 the batch prompt is used.
+        :param on_partial: Optional callback receiving the fields of the question being streamed after
+                           every chunk, e.g. to render the question text before the choices arrive.
+        :return: The list of complete questions in the response.
+        :raises MalformedStreamError: If the response is malformed.
+        """
+        if not self.vectorstore:
+            raise ValueError("Vectorstore not provided.")
+
+        context = ContextPlanner.format_context(self.get_context_planner().next_context(count))
+        inputs = {"topic": self.topic, "context": context}
+        kind = "single"
+        if count > 1:
+            inputs["count"] = str(count)
+            kind = "batch"
+        chain = self.get_chain(f"{kind}_stream")
+
+        def run():
+            parser = IncrementalJSONParser(allowed_keys=[schema.name for schema in self.response_schemas])
+            stream = chain.stream(inputs)
+            try:
+                for chunk in stream:
+                    fields = parser.feed(getattr(chunk, "content", chunk))
+                    if on_partial:
+                        on_partial(fields)
+                    if parser.complete:
+                        break
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+            result = parser.result()
+            return result if isinstance(result, list) else [result]
+
+        items = self.call_llm(run, tokens=self.estimate_request_tokens(context))
+        return [item for item in items if self.list_output_parser.is_complete(item)]
+
+    def get_chain(self, kind):
+        """
+        Returns the compiled chain for single-question ("single") or batch ("batch") requests,
+        building it on first use. The "single_stream" and "batch_stream" variants stop at the LLM
+        and yield raw text for incremental parsing.
+
+        :param kind: The kind of chain.
+        :return: The prompt | llm | parser chain.
+        """
+        if self.service:
+            return self.service.get_chain(self, kind)
+        if kind not in self.chains:
+            self.chains[kind] = self.build_chain(kind)
+        return self.chains[kind]
+
+    def build_chain(self, kind):
+        """
+        Builds the prompt | llm | parser chain for single-question or batch requests.
 
-    def generate_quiz(self) -> list:
+        :param kind: "single" or "batch", optionally suffixed with "_stream" to leave out the parser.
+        :return: The compiled chain.
+        """
+        if not self.llm:
+            self.init_llm()
+
+        base, _, mode = kind.partition("_")
+        if base == "batch":
+            prompt = prompts.PromptTemplate(
+                template=self.batch_prompt_template,
+                input_variables=["topic", "context", "count"],
+                partial_variables={"format_instructions": self.list_format_instructions}
+            )
+            parser = self.list_output_parser
+        else:
+            prompt = prompts.PromptTemplate(
+                template=self.prompt_template,
+                input_variables=["topic", "context"],
+                partial_variables={"format_instructions": self.format_instructions}
+            )
+            parser = self.output_parser
+
+        if mode == "stream":
+            return prompt | self.llm
+        return prompt | self.llm | parser
+
+    def get_context_planner(self):
+        """
+        Returns the context planner for the current quiz, creating it on first use. Concurrent callers
+        get the same planner, so the quiz's context is retrieved once and sliced without overlaps.
+
+        :return: The ContextPlanner.
+        """
+        with self._planner_lock:
+            if self.context_planner is None:
+                self.context_planner = ContextPlanner(
+                    self.vectorstore.db, self.topic, pool_size=self.context_pool_size,
+                    cache_key=getattr(self.vectorstore, "db_collection_name", None),
+                    keyword_index=getattr(self.vectorstore, "keyword_index", None), mode=self.retrieval_mode
+                )
+            return self.context_planner
+
+    def timed_request(self, request, count):
+        """
+        Runs request_questions on a worker thread for a request tracked by generate_quiz.
+
+        :param request: The QuestionRequest, which records when the LLM call starts.
+        :param count: Number of questions to request.
+        :return: A list of candidate questions.
+        """
+        self._local.request = request
+        try:
+            return self.request_questions(count)
+        finally:
+            self._local.request = None
+
+    def call_llm(self, func, *args, tokens=0):
+        """
+        Calls the LLM through the rate limiter. The request timeout starts once the limiter lets the call
+        through, so time spent waiting for quota or backing off is not counted, and a request abandoned in
+        the meantime is not sent at all.
+
+        :param func: The LLM call to make.
+        :param tokens: Estimated number of tokens the call will use.
+        :return: The return value of ``func``.
+        :raises RequestAbandoned: If generate_quiz stopped waiting for the request before the call.
+        """
+        request = getattr(self._local, "request", None)
+
+        def start(*call_args):
+            if request is not None:
+                if request.abandoned.is_set():
+                    raise RequestAbandoned("The request was abandoned before the LLM was called.")
+                request.started = time.monotonic()
+            try:
+                return func(*call_args)
+            except Exception:
+                if request is not None:
+                    request.started = None  # Not timed while backing off; a retry restarts the clock
+                raise
+
+        return self.rate_limiter.call(start, *args, tokens=tokens)
+
+    def request_questions(self, count):
+        """
+        Requests up to ``count`` questions, in one batch call or as a single-question call.
+
+        :param count: Number of questions wanted from this request.
+        :return: A list of candidate questions.
+        """
+        if self.stream:
+            return self.stream_questions(count)
+        if self.batch_size == 1 or count == 1:
+            return [self.generate_question_with_vectorstore()]
+        return self.generate_questions_batch(count)
+
+    def estimate_request_tokens(self, context="") -> int:
+        """
+        Estimates the tokens used by one question request: the prompt, the context and the maximum
+        response size.
+
+        :param context: The context included in the prompt.
+        :return: The estimated number of tokens.
+        """
+        prompt_tokens = estimate_tokens(self.prompt_template + self.format_instructions + self.topic + context)
+        return prompt_tokens + self.max_output_tokens
+
+    def new_question_index(self):
+        """
+        Creates an empty question similarity index using the vectorstore's embedding model, if any.
+
+        :return: A QuestionSimilarityIndex.
+        """
+        embed_model = getattr(self.vectorstore, "embed_model", None)
+        return QuestionSimilarityIndex(embed_model, threshold=self.similarity_threshold)
+
+    def get_cache_key(self):
+        """
+        Builds the question cache key for the current quiz from the document set, topic, model and prompt version.
+
+        :return: The cache key, or None if caching is disabled or the document set is unknown.
+        """
+        if not self.question_cache:
+            return None
+        processor = getattr(self.vectorstore, "processor", None)
+        document_set = processor.fingerprint() if processor else None
+        if not document_set:
+            return None
+        return QuestionCache.make_key(document_set, self.topic, self.model_name, PROMPT_VERSION)
+
+    def serve_cached_questions(self, cache_key, on_question=None) -> int:
+        """
+        Fills the question bank with validated questions from the question cache.
+
+        :param cache_key: The quiz's cache key.
+        :param on_question: Optional callback receiving each accepted question.
+        :return: The number of questions served from the cache.
+        """
+        # Page through the pool so only questions actually served are loaded, touched and counted as hits
+        served = []
+        for question in self.question_cache.iter_pool(cache_key, page_size=max(2 * self.num_questions, 1)):
+            if len(self.question_bank) >= self.num_questions:
+                break
+            if self.validate_question(question):
+                self.accept_question(question, on_question)
+                served.append(question)
+        self.question_cache.mark_served(cache_key, served)
+        return len(served)
+
+    def accept_question(self, question, on_question=None):
+        """
+        Adds a validated question to the question bank and the similarity index.
+
+        :param question: The validated question.
+        :param on_question: Optional callback receiving the question as soon as it is accepted.
+        """
+        self.question_bank.append(question)
+        self.question_index.add(question['question'])
+        if on_question:
+            on_question(question)
+
+    def generate_quiz(self, on_question=None, stop_event=None) -> list:
         """
         Generates a quiz by creating multiple questions based on the topic.
-        
+
+        Question requests run on a thread pool with up to ``max_workers`` in flight at once.
+        Each result is validated against the shared question bank as soon as it arrives, and
+        requests whose LLM call is still running ``request_timeout`` seconds after it started are abandoned and
+        counted as failed attempts; time spent waiting on the rate limiter does not count. An abandoned request
+        keeps its thread, so the pool holds spare threads and replacements never queue behind hung calls; once hung
+        requests hold every spare thread the quiz is returned short.
+        Request pacing is left to the rate limiter, so retries are not delayed unless the quota is.
+        With ``batch_size`` above 1 each request asks for several questions at once; parsed items are
+        validated one by one and only the shortfall is requested again.
+        Questions cached for the same documents, topic, model and prompt are served first, so only the
+        remaining shortfall is generated; newly generated questions are added to the cache.
+
+        :param on_question: Optional callback receiving each question as soon as it is accepted, so a
+                            caller can show the first questions while the rest are generated.
+        :param stop_event: Optional threading.Event; once set, no new requests are made and the questions
+                           accepted so far are returned.
         :return: A tuple containing the list of generated questions and the raw responses.
         """
         self.question_bank = []
+        self.question_index = (
+            self.shared_question_index if self.shared_question_index is not None else self.new_question_index()
+        )
+        self.context_planner = None  # One retrieval per quiz, shared by all requests
+        if self.vectorstore:
+            self.get_context_planner()  # Built before the workers start, which all use this one
         raw_responses = []  # Store raw LLM responses
 
-        for _ in range(self.num_questions):
-            for _ in range(0, 10):
-                response = self.generate_question_with_vectorstore()
-                raw_responses.append(response)  # Append raw response for later display
+        cache_key = self.get_cache_key()
+        served = self.serve_cached_questions(cache_key, on_question) if cache_key else 0
+        if served:
+            print(f"Served {served} questions from the question cache.")
+        if served >= self.num_questions:
+            return self.question_bank, raw_responses
 
-                # Check if response is valid
-                if response and self.validate_question(response):
-                    print("Successfully generated unique question")
-                    self.question_bank.append(response)
+        if not self.llm:
+            self.init_llm()  # Initialize once so workers share the same client
+
+        max_attempts = self.num_questions * self.max_retries
+        attempts = 0
+        in_flight = {}  # Future -> QuestionRequest
+        requested = {}  # Future -> number of questions requested
+        abandoned = set()  # Timed-out requests still holding a thread
+
+        pool_size = 2 * self.max_workers  # Spare threads for replacements of timed-out requests
+        executor = ThreadPoolExecutor(max_workers=pool_size)
+        try:
+            while len(self.question_bank) < self.num_questions:
+                if stop_event is not None and stop_event.is_set():
+                    print("Quiz generation stopped.")
+                    break
+
+                # Top up the pool without requesting more than the remaining shortfall, only onto free threads
+                abandoned = {future for future in abandoned if not future.done()}
+                shortfall = self.num_questions - len(self.question_bank) - sum(requested.values())
+                while (shortfall > 0 and len(in_flight) < self.max_workers and attempts < max_attempts
+                       and len(in_flight) + len(abandoned) < pool_size):
+                    count = min(self.batch_size, shortfall)
+                    request = QuestionRequest()
+                    future = executor.submit(self.timed_request, request, count)
+                    in_flight[future] = request
+                    requested[future] = count
+                    shortfall -= count
+                    attempts += 1
+
+                if not in_flight:
+                    if attempts < max_attempts:
+                        print("Question requests keep timing out; returning a partial quiz.")
+                    else:
+                        print("Maximum retries reached; returning a partial quiz.")
                     break
-                else:
-                    print("Duplicate or invalid question detected.")
 
-                # Add a delay to avoid exceeding quotas
-                time.sleep(20)  # Wait 20 seconds before the next request
+                timeout = None
+                if self.request_timeout:
+                    running = [started for started in (request.started for request in in_flight.values())
+                               if started is not None]
+                    if running:
+                        timeout = max(0, min(running) + self.request_timeout - time.monotonic())
+                    else:
+                        timeout = 0.5  # Requests are waiting for a thread or for quota; check again shortly
+                if stop_event is not None:
+                    timeout = 0.5 if timeout is None else min(timeout, 0.5)  # Notice a stop request promptly
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    del in_flight[future]
+                    del requested[future]
+                    try:
+                        responses = future.result()
+                    except Exception as e:
+                        print(f"Question generation failed: {e}")
+                        continue
+                    raw_responses.extend(responses)  # Append raw responses for later display
+
+                    # Validate against the shared bank as each result arrives
+                    for response in responses:
+                        if response and len(self.question_bank) < self.num_questions and self.validate_question(response):
+                            print("Successfully generated unique question")
+                            self.accept_question(response, on_question)
+                        else:
+                            print("Duplicate or invalid question detected.")
+
+                # Abandon requests that have exceeded the per-request timeout
+                if self.request_timeout:
+                    now = time.monotonic()
+                    for future, request in list(in_flight.items()):
+                        started = request.started
+                        if started is not None and now - started >= self.request_timeout:
+                            print("Question request timed out.")
+                            request.abandoned.set()  # A quota retry of it is not sent
+                            abandoned.add(future)
+                            del in_flight[future]
+                            del requested[future]
+        finally:
+            # Requests still waiting for quota are dropped instead of spending it on unused results
+            for request in in_flight.values():
+                request.abandoned.set()
+            # Do not block on abandoned requests; they finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if cache_key and len(self.question_bank) > served:
+            self.question_cache.put(cache_key, self.question_bank[served:])
 
         return self.question_bank, raw_responses
 
     def validate_question(self, question: dict) -> bool:
         """
-        Validates the uniqueness of the generated quiz question.
+        Validates the uniqueness of the generated quiz question. Exact and rephrased duplicates are
+        rejected using the question similarity index instead of a scan of the question bank.
         
         :param question: The generated quiz question.
         :return: True if the question is unique, False otherwise.
         """
         is_unique = True
-        question_text = question['question']
+        question_text = question.get('question')
         if not question_text:
             is_unique = False
-        else:
-            for dictionary in self.question_bank:
-                if dictionary['question'] == question_text:
-                    is_unique = False
+        elif self.question_index.is_duplicate(question_text):
+            is_unique = False
 
         return is_unique
 
+class QuizGeneratorService:
+    def __init__(self, llm=None, model_name="gemini-1.5-flash", temperature=1.0, **generator_options):
+        """
+        Initializes a long-lived quiz generation service that holds the LLM clients and compiled chains.
+        Create it once per process (e.g. with Resource_Registry.get_quiz_service) and pass per-request parameters to
+        generate_quiz, so quizzes pay no client setup or chain construction.
+
+        :param llm: Optional pre-built LLM shared by every request. Defaults to Gemini on Vertex AI.
+        :param model_name: Gemini model used when no LLM is given.
+        :param temperature: Sampling temperature used when no LLM is given.
+        :param generator_options: Default QuizGenerator options, e.g. max_workers or batch_size.
+        """
+        self.llm = llm
+        self.model_name = model_name
+        self.temperature = temperature
+        self.generator_options = generator_options
+        self._lock = threading.Lock()
+        self._llms = {}    # max_output_tokens -> LLM client
+        self._chains = {}  # (kind, max_output_tokens) -> compiled chain
+
+    def get_llm(self, max_output_tokens):
+        """
+        Returns the shared LLM client for a response size, creating it on first use.
+
+        :param max_output_tokens: Maximum number of tokens per response.
+        :return: The LLM client.
+        """
+        if self.llm:
+            return self.llm
+        with self._lock:
+            if max_output_tokens not in self._llms:
+                self._llms[max_output_tokens] = vertexai.VertexAI(
+                    model_name=self.model_name,
+                    temperature=self.temperature,
+                    max_output_tokens=max_output_tokens
+                )
+            return self._llms[max_output_tokens]
+
+    def get_chain(self, generator, kind):
+        """
+        Returns the shared compiled chain for a generator's request kind, building it on first use.
+
+        :param generator: The QuizGenerator asking for the chain.
+        :param kind: "single" or "batch".
+        :return: The compiled chain.
+        """
+        key = (kind, generator.max_output_tokens)
+        with self._lock:
+            chain = self._chains.get(key)
+        if chain is None:
+            chain = generator.build_chain(kind)
+            with self._lock:
+                chain = self._chains.setdefault(key, chain)
+        return chain
+
+    def generate_quiz(self, topic, num_questions, vectorstore, on_question=None, stop_event=None, **options):
+        """
+        Generates a quiz for one request using the shared clients and chains.
+
+        :param topic: The topic for the quiz.
+        :param num_questions: Number of questions for the quiz.
+        :param vectorstore: The ChromaCollectionCreator holding the quiz's collection.
+        :param on_question: Optional callback receiving each question as soon as it is accepted.
+        :param stop_event: Optional threading.Event that stops the quiz early when set.
+        :param options: QuizGenerator options overriding the service defaults.
+        :return: A tuple containing the list of generated questions and the raw responses.
+        """
+        generator = QuizGenerator(
+            topic, num_questions, vectorstore, service=self, **{**self.generator_options, **options}
+        )
+        return generator.generate_quiz(on_question, stop_event)
+
 if __name__ == "__main__":
+    from Document_Processor import DocumentProcessor
+    from Chroma_Collection_Creator import ChromaCollectionCreator
+    from Resource_Registry import get_embedding_client
     
     embed_config = {
         "model_name": "textembedding-gecko@003",
@@ -174,15 +679,14 @@ if __name__ == "__main__":
         processor = DocumentProcessor()
         processor.ingest_documents()
 
-        embed_client = EmbeddingClient(**embed_config)  # Initialize from Task 4
+        embed_client = get_embedding_client(**embed_config)  # Shared across sessions
 
         # Initialize ChromaCollectionCreator with persistence
         chroma_creator = ChromaCollectionCreator(processor, embed_client, persist_directory=persist_directory)
         
-        # Load existing Chroma collection from disk, if it exists
-        if not chroma_creator.db:
+        # Index new chunks incrementally; an existing collection is reused as-is
+        if processor.pages:
             chroma_creator.create_chroma_collection()
-            st.success("New Chroma collection successfully created!", icon="✅")
 
         question = None
         question_bank = None
@@ -197,8 +701,25 @@ if __name__ == "__main__":
 
             submitted = st.form_submit_button("Submit")
             if submitted:
-                generator = QuizGenerator(topic_input, questions, chroma_creator)
-                question_bank, raw_responses = generator.generate_quiz()
+                generator = QuizGenerator(topic_input, questions, chroma_creator, stream=True)
+
+                # Stream each question so its text shows while the choices are still arriving
+                for _ in range(generator.num_questions * generator.max_retries):
+                    if len(generator.question_bank) >= generator.num_questions:
+                        break
+                    preview = st.empty()
+                    try:
+                        streamed = generator.stream_questions(
+                            on_partial=lambda fields: preview.write(fields.get("question", ""))
+                        )
+                    except Exception as e:
+                        print(f"Question generation failed: {e}")
+                        streamed = []
+                    preview.empty()
+                    for response in streamed:
+                        if generator.validate_question(response):
+                            generator.accept_question(response)
+                question_bank = generator.question_bank
                 question = question_bank[0]
 
     if question_bank:
@@ -1,16 +1,12 @@
 import streamlit as st
 import os
-import sys
 import json
 import time
 
-# Adjust the path to include the root directory of your project
-sys.path.append(os.path.abspath('../../'))
-
 # Import necessary classes from other tasks
 from Document_Processor import DocumentProcessor
-from Embedding_Client import EmbeddingClient
 from Chroma_Collection_Creator import ChromaCollectionCreator
+from Resource_Registry import get_embedding_client
 from langchain.output_parsers import ResponseSchema, StructuredOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_google_vertexai import VertexAI
@@ -179,15 +175,14 @@ if __name__ == "__main__":
         processor = DocumentProcessor()
         processor.ingest_documents()
 
-        embed_client = EmbeddingClient(**embed_config)  # Initialize from Task 4
+        embed_client = get_embedding_client(**embed_config)  # Shared across sessions
 
         # Initialize ChromaCollectionCreator with persistence
         chroma_creator = ChromaCollectionCreator(processor, embed_client, persist_directory=persist_directory)
 
-        # Load existing Chroma collection from disk, if it exists
-        if not chroma_creator.db:
+        # Index new chunks incrementally; an existing collection is reused as-is
+        if processor.pages:
             chroma_creator.create_chroma_collection()
-            st.success("New Chroma collection successfully created!", icon="✅")
             
         question = None
         question_bank = None
@@ -0,0 +1,278 @@
+import queue
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+class QuizJob:
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, key, topic, num_questions, vectorstore, options=None, speculative=False):
+        """
+        Initializes a background quiz generation job. Questions are appended to ``questions`` as soon
+        as they are accepted, so readers can use the first questions before the job finishes.
+
+        :param key: Key identifying equivalent jobs (document set, topic, question count and options).
+        :param topic: The topic for the quiz.
+        :param num_questions: Number of questions for the quiz.
+        :param vectorstore: The ChromaCollectionCreator holding the quiz's collection.
+        :param options: Optional QuizGenerator options.
+        :param speculative: Whether the job pre-generates a quiz nobody has asked for yet.
+        """
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.topic = topic
+        self.num_questions = num_questions
+        self.vectorstore = vectorstore
+        self.options = options or {}
+        self.speculative = speculative
+        self.status = self.PENDING
+        self.questions = []
+        self.raw_responses = []
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.subscribers = set()  # Sessions waiting for this job; it is cancelled when the last one leaves
+        self.stop_event = threading.Event()  # Asks a running job to stop early
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (self.DONE, self.FAILED, self.CANCELLED)
+
+    def add_question(self, question):
+        """
+        Appends an accepted question and wakes up waiting readers.
+
+        :param question: The validated question.
+        """
+        with self._changed:
+            self.questions.append(question)
+            self._changed.notify_all()
+
+    def set_status(self, status, error=None):
+        """
+        Updates the job status and wakes up waiting readers.
+
+        :param status: One of the job status constants.
+        :param error: Optional error message for failed jobs.
+        """
+        with self._changed:
+            self.status = status
+            self.error = error
+            if status == self.RUNNING:
+                self.started = time.time()
+            elif self.done:
+                self.finished = time.time()
+            self._changed.notify_all()
+
+    def wait_for(self, count, timeout=None) -> bool:
+        """
+        Blocks until at least ``count`` questions are available or the job has finished.
+
+        :param count: Number of questions to wait for.
+        :param timeout: Optional maximum number of seconds to wait.
+        :return: True if ``count`` questions are available.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.questions) >= count or self.done, timeout=timeout)
+            return len(self.questions) >= count
+
+    def progress(self) -> dict:
+        """
+        Returns a snapshot of the job state for status polling.
+
+        :return: A dictionary with the status, question counts, error and elapsed seconds.
+        """
+        with self._changed:
+            end = self.finished or time.time()
+            return {
+                "id": self.id,
+                "status": self.status,
+                "ready": len(self.questions),
+                "total": self.num_questions,
+                "error": self.error,
+                "elapsed": end - self.started if self.started else 0.0,
+            }
+
+class QuizJobQueue:
+    SUBMITTED = 0    # Priority of jobs a session is waiting for
+    SPECULATIVE = 1  # Priority of pre-generation jobs, which never delay submitted ones
+
+    def __init__(self, service, num_workers=4, max_jobs=64):
+        """
+        Initializes a local job queue that generates quizzes on background worker threads, so a quiz can
+        be pre-generated while the user is still on the form. Queued jobs that a session submitted run
+        before speculative pre-generation jobs.
+
+        :param service: QuizGeneratorService used to generate the quizzes.
+        :param num_workers: Number of worker threads; each runs one quiz at a time, so size it to the number
+                            of sessions expected to generate quizzes at once.
+        :param max_jobs: Number of finished jobs kept for status lookups before the oldest are dropped.
+        """
+        self.service = service
+        self.num_workers = num_workers
+        self.max_jobs = max_jobs
+        self._queue = queue.PriorityQueue()  # (priority, sequence, job); the sequence keeps FIFO order per priority
+        self._sequence = itertools.count()
+        self._jobs = OrderedDict()  # Job ID -> QuizJob, oldest first
+        self._by_key = {}           # Job key -> latest QuizJob
+        self._lock = threading.Lock()
+        self._workers = []
+
+    @staticmethod
+    def make_key(topic, num_questions, vectorstore, options=None) -> tuple:
+        """
+        Builds the key under which equivalent jobs are deduplicated; jobs with different generation
+        options are never shared.
+        """
+        processor = getattr(vectorstore, "processor", None)
+        document_set = processor.fingerprint() if processor else None
+        options_key = tuple((name, repr(value)) for name, value in sorted((options or {}).items()))
+        return (document_set or id(vectorstore), " ".join(topic.lower().split()), num_questions, options_key)
+
+    def submit(self, topic, num_questions, vectorstore, subscriber=None, speculative=False, **options) -> QuizJob:
+        """
+        Queues a quiz generation job, reusing an equivalent job that is queued, running or finished.
+
+        :param topic: The topic for the quiz.
+        :param num_questions: Number of questions for the quiz.
+        :param vectorstore: The ChromaCollectionCreator holding the quiz's collection.
+        :param subscriber: Optional ID of the session waiting for the job, released with ``release``.
+        :param speculative: Pre-generate at low priority, e.g. while the user is still on the form. Call
+                            ``promote`` once the quiz is actually requested.
+        :param options: QuizGenerator options for this job.
+        :return: The QuizJob.
+        """
+        key = self.make_key(topic, num_questions, vectorstore, options)
+        with self._lock:
+            job = self._by_key.get(key)
+            if job and job.status not in (QuizJob.FAILED, QuizJob.CANCELLED) and not job.stop_event.is_set():
+                if subscriber is not None:
+                    job.subscribers.add(subscriber)
+                reused = True
+            else:
+                job = QuizJob(key, topic, num_questions, vectorstore, options, speculative)
+                if subscriber is not None:
+                    job.subscribers.add(subscriber)
+                self._jobs[job.id] = job
+                self._by_key[key] = job
+                self._prune()
+                self._start_workers()
+                reused = False
+        if not reused:
+            self._queue.put((self.SPECULATIVE if speculative else self.SUBMITTED, next(self._sequence), job))
+        elif not speculative:
+            self.promote(job)
+        return job
+
+    def promote(self, job) -> bool:
+        """
+        Moves a queued speculative job ahead of the other pre-generation jobs, once a session submits it.
+
+        :param job: The QuizJob.
+        :return: True if the job was still queued at low priority.
+        """
+        with self._lock:
+            if job.status != QuizJob.PENDING or not job.speculative:
+                return False
+            job.speculative = False
+        # The low-priority entry stays queued and is skipped once the job has run
+        self._queue.put((self.SUBMITTED, next(self._sequence), job))
+        return True
+
+    def release(self, job, subscriber):
+        """
+        Removes a session from a job's subscribers, e.g. when the user changed the topic. The job is
+        cancelled once no session is waiting for it, so a job shared with another session keeps running.
+
+        :param job: The QuizJob.
+        :param subscriber: The session ID passed to ``submit``.
+        :return: True if the job was cancelled.
+        """
+        with self._lock:
+            job.subscribers.discard(subscriber)
+            if job.subscribers:
+                return False
+            return self._cancel(job)
+
+    def cancel(self, job):
+        """
+        Cancels a job regardless of its subscribers. A queued job is dropped; a running job is asked to
+        stop and frees its worker after its in-flight requests.
+
+        :param job: The QuizJob.
+        :return: True if the job was cancelled or asked to stop.
+        """
+        with self._lock:
+            return self._cancel(job)
+
+    def _cancel(self, job):
+        if job.status == QuizJob.PENDING:
+            job.set_status(QuizJob.CANCELLED)
+            return True
+        if job.status == QuizJob.RUNNING:
+            job.stop_event.set()
+            return True
+        return False
+
+    def get(self, job_id):
+        """
+        Looks up a job by ID.
+
+        :param job_id: The job ID.
+        :return: The QuizJob, or None if it is unknown or was pruned.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        # Drop the oldest finished jobs beyond max_jobs; queued and running jobs are kept
+        excess = len(self._jobs) - self.max_jobs
+        for job_id, job in list(self._jobs.items()):
+            if excess <= 0:
+                break
+            if job.done:
+                del self._jobs[job_id]
+                if self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+                excess -= 1
+
+    def _start_workers(self):
+        # Workers start on the first submission
+        while len(self._workers) < self.num_workers:
+            worker = threading.Thread(target=self._work, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            with self._lock:
+                if job.status != QuizJob.PENDING:  # Cancelled while queued, or already run after a promotion
+                    self._queue.task_done()
+                    continue
+                job.set_status(QuizJob.RUNNING)
+            try:
+                _, raw_responses = self.service.generate_quiz(
+                    job.topic, job.num_questions, job.vectorstore, on_question=job.add_question,
+                    stop_event=job.stop_event, **job.options
+                )
+                job.raw_responses = raw_responses
+                if job.stop_event.is_set():
+                    job.set_status(QuizJob.CANCELLED)
+                elif job.questions:
+                    job.set_status(QuizJob.DONE)
+                else:
+                    job.set_status(QuizJob.FAILED, "No questions could be generated.")
+            except Exception as e:
+                print(f"Quiz generation job failed: {e}")
+                job.set_status(QuizJob.FAILED, str(e))
+            finally:
+                self._queue.task_done()
@@ -1,51 +1,138 @@
-import streamlit as st
-import os
-import sys
 import time
+import queue
+import threading
+from concurrent.futures import Future
 
-# Adjust the path to include the root directory of your project
-sys.path.append(os.path.abspath('../../'))
+from Lazy_Import import lazy_import
 
-# Import necessary classes from other tasks
-from Document_Processor import DocumentProcessor
-from Embedding_Client import EmbeddingClient
-from Chroma_Collection_Creator import ChromaCollectionCreator
-from Quiz_Generator import QuizGenerator
+st = lazy_import("streamlit")  # Only the navigation helpers and the demo need Streamlit
 
 # QuizManager class to manage quiz state and navigation
 class QuizManager:
-    def __init__(self, questions: list):
+    def __init__(self, questions, expected_total=None):
         """
-        Initializes the QuizManager with a list of questions.
+        Initializes the QuizManager with a list of questions or a source that delivers them over time:
+        a QuizJob, a queue.Queue (ended by None), a Future, or any iterable such as a generator.
+        Navigation covers the questions available so far and grows as more arrive.
         
-        :param questions: List of quiz questions.
+        :param questions: List of quiz questions or a growing question source.
+        :param expected_total: Optional number of questions the source will deliver.
         """
-        self.questions = questions
-        self.total_questions = len(questions)
+        self._lock = threading.Lock()
+        self._source = None
+        self._complete = True
+        self.expected_total = expected_total
+
+        if isinstance(questions, list):
+            self.questions = questions
+        else:
+            self.questions = []
+            self._complete = False
+            if hasattr(questions, "progress") and hasattr(questions, "questions"):
+                # A QuizJob appends to its own list as questions are accepted
+                self._source = questions
+                self.expected_total = expected_total or questions.num_questions
+            elif isinstance(questions, (queue.Queue, Future)):
+                self._source = questions
+            else:
+                # Drain iterables on a background thread so navigation never blocks on generation
+                self._source = queue.Queue()
+                threading.Thread(target=self._drain, args=(questions, self._source), daemon=True).start()
+
+    @staticmethod
+    def _drain(iterable, target):
+        try:
+            for question in iterable:
+                target.put(question)
+        finally:
+            target.put(None)
+
+    def refresh(self):
+        """
+        Collects the questions that have arrived from the source since the last call.
+        """
+        with self._lock:
+            if self._complete:
+                return
+            source = self._source
+            if isinstance(source, queue.Queue):
+                while True:
+                    try:
+                        question = source.get_nowait()
+                    except queue.Empty:
+                        break
+                    if question is None:
+                        self._complete = True
+                        break
+                    self.questions.append(question)
+            elif isinstance(source, Future):
+                if source.done():
+                    result = [] if source.exception() else source.result()
+                    if isinstance(result, tuple):  # generate_quiz returns (questions, raw responses)
+                        result = result[0]
+                    self.questions.extend(result)
+                    self._complete = True
+            else:
+                done = source.done  # Read before the questions so none are missed
+                self.questions.extend(source.questions[len(self.questions):])
+                self._complete = done
+
+    @property
+    def is_complete(self) -> bool:
+        """
+        Whether the source has delivered all of its questions.
+        """
+        self.refresh()
+        return self._complete
+
+    @property
+    def total_questions(self) -> int:
+        """
+        Number of questions available so far.
+        """
+        self.refresh()
+        return len(self.questions)
 
     def get_question_at_index(self, index: int):
         """
         Retrieves the question at the specified index.
         
         :param index: Index of the question to retrieve.
-        :return: The question at the specified index.
+        :return: The question at the specified index, or None if no question has arrived yet.
         """
-        valid_index = index % self.total_questions
+        total = self.total_questions
+        if total == 0:
+            return None
+        valid_index = index % total
         return self.questions[valid_index]
 
     def next_question_index(self, direction=1):
         """
-        Moves to the next question index.
+        Moves to the next question index. While more questions are on the way, moving past the last
+        available question stays on it instead of wrapping around.
         
         :param direction: Direction to move (1 for next, -1 for previous).
         :return: The new question index.
         """
         current_index = st.session_state.get("question_index", 0)
-        new_index = (current_index + direction) % self.total_questions
+        total = self.total_questions
+        if total == 0:
+            return current_index
+        new_index = current_index + direction
+        if new_index >= total and not self.is_complete:
+            new_index = total - 1
+        else:
+            new_index %= total
         st.session_state["question_index"] = new_index
         return new_index
 
 if __name__ == "__main__":
+    # Import necessary classes from other tasks
+    from Document_Processor import DocumentProcessor
+    from Chroma_Collection_Creator import ChromaCollectionCreator
+    from Resource_Registry import get_embedding_client
+    from Quiz_Generator import QuizGenerator
+
     # Embed config
     embed_config = {
         "model_name": "textembedding-gecko@003",
@@ -69,7 +156,7 @@ if __name__ == "__main__":
                 processor = DocumentProcessor()
                 processor.ingest_documents()
 
-                embed_client = EmbeddingClient(**embed_config)
+                embed_client = get_embedding_client(**embed_config)  # Shared across sessions
 
                 topic_input = st.text_input("Topic for Generative Quiz", placeholder="Enter the topic of the document")
                 questions_count = st.slider("Number of Questions", min_value=1, max_value=10, value=1)
@@ -80,9 +167,9 @@ if __name__ == "__main__":
                     persist_directory = "chroma_persistence_directory"
                     chroma_creator = ChromaCollectionCreator(processor, embed_client, persist_directory=persist_directory)
                     
-                    if not chroma_creator.db:
+                    # Index new chunks incrementally; an existing collection is reused as-is
+                    if processor.pages:
                         chroma_creator.create_chroma_collection()
-                        st.success("New Chroma collection successfully created!", icon="✅")
 
                     generator = QuizGenerator(topic_input, questions_count, chroma_creator)
                     question_bank, raw_responses = generator.generate_quiz()
@@ -0,0 +1,187 @@
+import re
+import random
+import threading
+import time
+
+class RateLimiter:
+    def __init__(self, requests_per_minute=60, tokens_per_minute=None, max_retries=5,
+                 base_delay=1.0, max_delay=60.0):
+        """
+        Initializes a token-bucket rate limiter shared by every caller of a quota-limited API.
+
+        :param requests_per_minute: Request quota per minute. None disables the request bucket.
+        :param tokens_per_minute: Token quota per minute. None disables the token bucket.
+        :param max_retries: Maximum retries after a quota (429 / ResourceExhausted) error.
+        :param base_delay: Initial backoff delay in seconds after a quota error.
+        :param max_delay: Upper bound for a single backoff delay in seconds.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._request_level = float(requests_per_minute or 0)  # Buckets start full
+        self._token_level = float(tokens_per_minute or 0)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0  # Shared pause after a quota error
+
+        # Counters exposed through stats()
+        self.acquire_count = 0
+        self.wait_count = 0
+        self.wait_time = 0.0
+        self.quota_errors = 0
+        self.backoff_time = 0.0
+
+    def _refill(self, now):
+        """
+        Refills both buckets for the time elapsed since the last refill. Caller must hold the lock.
+        """
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self.requests_per_minute:
+            self._request_level = min(self.requests_per_minute,
+                                      self._request_level + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._token_level = min(self.tokens_per_minute,
+                                    self._token_level + elapsed * self.tokens_per_minute / 60)
+
+    def acquire(self, tokens=0, requests=1):
+        """
+        Blocks until the buckets can cover the request, then consumes from them.
+
+        :param tokens: Estimated number of tokens the request will use.
+        :param requests: Number of API requests being made.
+        :return: Seconds spent waiting.
+        """
+        # A single request larger than a bucket would never fit, so clamp it to the bucket size
+        if self.requests_per_minute:
+            requests = min(requests, self.requests_per_minute)
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                delay = max(0.0, self._blocked_until - now)
+                if self.requests_per_minute and self._request_level < requests:
+                    deficit = requests - self._request_level
+                    delay = max(delay, deficit * 60 / self.requests_per_minute)
+                if self.tokens_per_minute and self._token_level < tokens:
+                    deficit = tokens - self._token_level
+                    delay = max(delay, deficit * 60 / self.tokens_per_minute)
+
+                if delay <= 0:
+                    if self.requests_per_minute:
+                        self._request_level -= requests
+                    if self.tokens_per_minute:
+                        self._token_level -= tokens
+                    self.acquire_count += 1
+                    if waited:
+                        self.wait_count += 1
+                        self.wait_time += waited
+                    return waited
+
+            time.sleep(delay)
+            waited += delay
+
+    def backoff(self, attempt):
+        """
+        Pauses all callers after a quota error using exponential backoff with full jitter.
+
+        :param attempt: Zero-based retry attempt number.
+        :return: The backoff delay in seconds.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        with self._lock:
+            self.quota_errors += 1
+            self.backoff_time += delay
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
+
+    def call(self, func, *args, tokens=0, requests=1, **kwargs):
+        """
+        Calls ``func`` once the quota allows it, retrying with backoff on quota errors.
+
+        :param func: The API call to make.
+        :param tokens: Estimated number of tokens the call will use.
+        :param requests: Number of API requests the call makes.
+        :return: The return value of ``func``.
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens=tokens, requests=requests)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not is_quota_error(e) or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                print(f"Quota exceeded, backing off for {delay:.1f}s (retry {attempt + 1}/{self.max_retries}).")
+                attempt += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the limiter counters.
+
+        :return: A dictionary with acquire, wait and backoff counters.
+        """
+        with self._lock:
+            return {
+                "acquire_count": self.acquire_count,
+                "wait_count": self.wait_count,
+                "wait_time": self.wait_time,
+                "quota_errors": self.quota_errors,
+                "backoff_time": self.backoff_time,
+            }
+
+# A bare "429" also appears in offsets and counts, so it only counts next to a quota phrase
+_QUOTA_MESSAGE = re.compile(r"\b429\b.{0,80}?(too many requests|quota|resource exhausted)|resource exhausted", re.IGNORECASE)
+
+def is_quota_error(error) -> bool:
+    """
+    Checks whether an exception is a quota / rate limit error (HTTP 429 or ResourceExhausted).
+
+    :param error: The exception raised by the API client.
+    :return: True if the error signals an exhausted quota.
+    """
+    try:
+        from google.api_core.exceptions import ResourceExhausted, TooManyRequests
+        if isinstance(error, (ResourceExhausted, TooManyRequests)):
+            return True
+    except ImportError:
+        pass
+
+    if getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429:
+        return True
+    return type(error).__name__ in ("ResourceExhausted", "TooManyRequests", "RateLimitError") \
+        or bool(_QUOTA_MESSAGE.search(str(error)))
+
+def estimate_tokens(text) -> int:
+    """
+    Roughly estimates the token count of a text (about four characters per token).
+
+    :param text: The text to estimate.
+    :return: The estimated number of tokens.
+    """
+    return len(text) // 4 + 1
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(name, **kwargs) -> RateLimiter:
+    """
+    Returns the process-wide rate limiter for a named quota, creating it on first use.
+
+    :param name: Name of the quota, e.g. "gemini" or "vertex-embeddings".
+    :param kwargs: RateLimiter arguments used when the limiter is first created.
+    :return: The shared RateLimiter instance.
+    """
+    with _rate_limiters_lock:
+        if name not in _rate_limiters:
+            _rate_limiters[name] = RateLimiter(**kwargs)
+        return _rate_limiters[name]
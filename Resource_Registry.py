@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+
+class _Resource:
+    def __init__(self, factory, health_check, check_interval):
+        self.factory = factory
+        self.health_check = health_check
+        self.check_interval = check_interval
+        self.value = None
+        self.built = False
+        self.created = None
+        self.last_check = None
+        self.builds = 0
+        self.failed_checks = 0
+        self.lock = threading.Lock()
+
+class ResourceRegistry:
+    def __init__(self):
+        """
+        Initializes a process-wide registry of shared resources (clients, database handles) that are
+        built once on first use and shared by every session and thread. Resources are rebuilt lazily
+        when their health check fails or after they are invalidated.
+        """
+        self._resources = {}  # Name -> _Resource
+        self._lock = threading.Lock()
+
+    def register(self, name, factory, health_check=None, check_interval=60.0):
+        """
+        Registers how to build a resource; registering an existing name keeps the existing resource.
+
+        :param name: Unique resource name.
+        :param factory: Function without arguments that builds the resource.
+        :param health_check: Optional function receiving the resource and returning False (or raising)
+                             when it is unusable.
+        :param check_interval: Minimum seconds between health checks of the resource.
+        """
+        with self._lock:
+            if name not in self._resources:
+                self._resources[name] = _Resource(factory, health_check, check_interval)
+
+    def get(self, name, factory=None, health_check=None, check_interval=60.0):
+        """
+        Returns a shared resource, building it on first use and rebuilding it if its periodic health
+        check fails.
+
+        :param name: Resource name.
+        :param factory: Optional factory, registering the resource if it is not registered yet.
+        :param health_check: Optional health check used when registering.
+        :param check_interval: Health check interval used when registering.
+        :return: The resource.
+        """
+        if factory is not None:
+            self.register(name, factory, health_check, check_interval)
+        with self._lock:
+            resource = self._resources.get(name)
+        if resource is None:
+            raise KeyError(f"Unknown resource: {name}")
+
+        # Build and check under the resource's own lock, so other resources are never blocked
+        with resource.lock:
+            now = time.monotonic()
+            if resource.built and resource.health_check and now - resource.last_check >= resource.check_interval:
+                resource.last_check = now
+                if not self._healthy(resource):
+                    print(f"Resource {name} failed its health check; reconnecting.")
+                    resource.failed_checks += 1
+                    resource.built = False
+            if not resource.built:
+                resource.value = resource.factory()
+                resource.built = True
+                resource.created = resource.last_check = time.monotonic()
+                resource.builds += 1
+            return resource.value
+
+    @staticmethod
+    def _healthy(resource) -> bool:
+        try:
+            return resource.health_check(resource.value) is not False
+        except Exception as e:
+            print(f"Health check raised: {e}")
+            return False
+
+    def invalidate(self, name):
+        """
+        Drops a resource so it is rebuilt on next use, e.g. after an operation on it failed.
+
+        :param name: Resource name.
+        """
+        with self._lock:
+            resource = self._resources.get(name)
+        if resource is not None:
+            with resource.lock:
+                resource.value = None
+                resource.built = False
+
+    def status(self) -> dict:
+        """
+        Returns the state of every registered resource.
+
+        :return: A dictionary mapping names to build counts, failed health checks and age in seconds.
+        """
+        with self._lock:
+            resources = dict(self._resources)
+        now = time.monotonic()
+        return {
+            name: {
+                "built": resource.built,
+                "builds": resource.builds,
+                "failed_checks": resource.failed_checks,
+                "age": now - resource.created if resource.built else None,
+            }
+            for name, resource in resources.items()
+        }
+
+_registry = ResourceRegistry()
+
+def _options_key(options) -> str:
+    # Stable name part for keyword arguments, so different configurations get different resources
+    return ",".join(f"{key}={value!r}" for key, value in sorted(options.items()))
+
+def get_registry() -> ResourceRegistry:
+    """
+    Returns the process-wide resource registry.
+    """
+    return _registry
+
+def get_embedding_client(**embed_config):
+    """
+    Returns the process-wide EmbeddingClient for an embedding configuration.
+
+    :param embed_config: EmbeddingClient arguments, e.g. model_name, project and location.
+    :return: The shared EmbeddingClient.
+    """
+    from Embedding_Client import EmbeddingClient
+
+    name = "embedding_client:" + _options_key(embed_config)
+    return _registry.get(name, lambda: EmbeddingClient(**embed_config))
+
+def get_vector_store(backend, collection_name, persist_directory, embed_model, **options):
+    """
+    Returns the process-wide vector store handle for a collection, embedding model and store options.
+    A persisted handle is health-checked with a one-row lookup and reopened if the check fails; an
+    in-memory store is never rebuilt, since reopening it would silently empty it.
+
+    :param backend: "chroma" or "numpy".
+    :param collection_name: Name of the collection.
+    :param persist_directory: Persist directory of the collection.
+    :param embed_model: Embedding model used by the store.
+    :param options: Extra arguments for the store (e.g. quantization for the numpy backend).
+    :return: The shared vector store.
+    """
+    def build():
+        if backend == "numpy":
+            from Numpy_Vector_Store import NumpyVectorStore as VectorStore
+        else:
+            from langchain_community.vectorstores import Chroma as VectorStore
+        return VectorStore(
+            collection_name=collection_name,
+            persist_directory=persist_directory,
+            embedding_function=embed_model,
+            **options
+        )
+
+    # The store holds on to the embedding model, so its id stays unique while the entry exists
+    name = f"vector_store:{backend}:{persist_directory}:{collection_name}:{id(embed_model)}:{_options_key(options)}"
+    health_check = None
+    if persist_directory:
+        health_check = lambda db: db.get(limit=1, include=[]) is not None
+    return _registry.get(name, build, health_check=health_check)
+
+def get_keyword_index(path):
+    """
+    Returns the process-wide BM25 keyword index stored at a path, loading it on first use.
+
+    :param path: Path of the persisted index, or None for an index that is never persisted.
+    :return: The shared BM25Index.
+    """
+    from Keyword_Index import BM25Index
+
+    if path is None:
+        return BM25Index()
+    return _registry.get(f"keyword_index:{path}", lambda: BM25Index.load(path) if os.path.exists(path) else BM25Index())
+
+def get_quiz_service(**service_options):
+    """
+    Returns the process-wide QuizGeneratorService holding the shared LLM clients and chains. Each
+    distinct set of options gets its own service.
+
+    :param service_options: QuizGeneratorService arguments, e.g. model_name or max_workers.
+    :return: The shared QuizGeneratorService.
+    """
+    from Quiz_Generator import QuizGeneratorService
+
+    name = "quiz_service:" + _options_key(service_options)
+    return _registry.get(name, lambda: QuizGeneratorService(**service_options))
+
+def get_quiz_job_queue(num_workers=4):
+    """
+    Returns the process-wide background quiz generation queue.
+
+    :param num_workers: Number of quizzes generated at once, used when the queue is first created.
+    :return: The shared QuizJobQueue.
+    """
+    from Quiz_Jobs import QuizJobQueue
+
+    return _registry.get("quiz_job_queue", lambda: QuizJobQueue(get_quiz_service(), num_workers=num_workers))
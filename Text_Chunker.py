@@ -0,0 +1,204 @@
+import re
+from collections import namedtuple
+
+# A chunk of a page: its text, character offsets within the page, and the heading it falls under
+Chunk = namedtuple("Chunk", ["text", "start", "end", "heading"])
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_WORD_PATTERN = re.compile(r"\S+")
+_SENTENCE_PATTERN = re.compile(r"[^.!?]+(?:[.!?]+|$)")
+# Title-case words must be separated by whitespace, so a long capitalized run can only match one way
+_HEADING_PATTERN = re.compile(r"^\s*(?:\d+(?:\.\d+)*\.?\s+\S.*|[A-Z][A-Z0-9 ,:&'-]{2,}|[A-Z]\w*(?:\s+[A-Z]\w*){0,7})$")
+
+def count_tokens(text) -> int:
+    """
+    Approximates the number of model tokens in a text by counting words and punctuation marks.
+
+    :param text: The text to measure.
+    :return: The approximate token count.
+    """
+    return len(_TOKEN_PATTERN.findall(text))
+
+class Chunker:
+    name = "base"
+
+    def __init__(self, chunk_size=256, chunk_overlap=32):
+        """
+        Initializes a chunker that packs text units into chunks of at most ``chunk_size`` tokens.
+
+        :param chunk_size: Maximum number of tokens per chunk.
+        :param chunk_overlap: Number of tokens repeated at the start of the next chunk.
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size.")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def units(self, text, start, end) -> list:
+        """
+        Splits a span of text into (start, end, tokens) units that chunks are built from.
+        """
+        raise NotImplementedError
+
+    def split_text(self, text) -> list:
+        """
+        Splits a page of text into chunks with character offsets.
+
+        :param text: The page text.
+        :return: A list of Chunks.
+        """
+        return self.pack(text, self.units(text, 0, len(text)))
+
+    def pack(self, text, units, heading=None) -> list:
+        """
+        Packs consecutive units into chunks of at most ``chunk_size`` tokens, carrying trailing units
+        of up to ``chunk_overlap`` tokens into the next chunk.
+        """
+        chunks = []
+        current = []
+        tokens = 0
+        pending = False  # Whether ``current`` holds units not emitted in a chunk yet
+        for unit in units:
+            # Units larger than a chunk are broken into word units, and oversized words into token runs
+            if unit[2] > self.chunk_size:
+                parts = _word_units(text, unit[0], unit[1], max_tokens=self.chunk_size)
+            else:
+                parts = [unit]
+            for part in parts:
+                if pending and tokens + part[2] > self.chunk_size:
+                    chunks.append(self._make_chunk(text, current, heading))
+                    pending = False
+                    # Keep the tail of the previous chunk as overlap
+                    overlap = []
+                    overlap_tokens = 0
+                    for previous in reversed(current):
+                        if overlap_tokens + previous[2] > self.chunk_overlap:
+                            break
+                        overlap.insert(0, previous)
+                        overlap_tokens += previous[2]
+                    # Drop overlap the next unit leaves no room for
+                    while overlap and overlap_tokens + part[2] > self.chunk_size:
+                        overlap_tokens -= overlap.pop(0)[2]
+                    current, tokens = overlap, overlap_tokens
+                current.append(part)
+                tokens += part[2]
+                pending = True
+        if pending:
+            chunks.append(self._make_chunk(text, current, heading))
+        return chunks
+
+    @staticmethod
+    def _make_chunk(text, units, heading):
+        start, end = units[0][0], units[-1][1]
+        return Chunk(text[start:end], start, end, heading)
+
+def _word_units(text, start, end, max_tokens=None) -> list:
+    """
+    Splits a span of text into word units with their token counts. With ``max_tokens``, words without
+    spaces that exceed it (e.g. URLs or dot leaders) are split further into runs of at most that many tokens.
+    """
+    units = []
+    for match in _WORD_PATTERN.finditer(text[start:end]):
+        word_start = start + match.start()
+        tokens = count_tokens(match.group())
+        if max_tokens is None or tokens <= max_tokens:
+            units.append((word_start, start + match.end(), tokens))
+            continue
+        # Token matches cover every character of a word, so consecutive runs tile it without gaps
+        spans = [token.span() for token in _TOKEN_PATTERN.finditer(match.group())]
+        for index in range(0, len(spans), max_tokens):
+            run = spans[index:index + max_tokens]
+            units.append((word_start + run[0][0], word_start + run[-1][1], len(run)))
+    return units
+
+def _sentence_units(text, start, end) -> list:
+    """
+    Splits a span of text into sentence units with their token counts.
+    """
+    units = []
+    for match in _SENTENCE_PATTERN.finditer(text[start:end]):
+        sentence = match.group()
+        stripped = sentence.strip()
+        if not stripped:
+            continue
+        sentence_start = start + match.start() + (len(sentence) - len(sentence.lstrip()))
+        units.append((sentence_start, sentence_start + len(stripped), count_tokens(stripped)))
+    return units
+
+class TokenChunker(Chunker):
+    name = "token"
+
+    def units(self, text, start, end) -> list:
+        """
+        Splits text into word units, so chunks have a fixed token budget regardless of sentence structure.
+        """
+        return _word_units(text, start, end)
+
+class SentenceChunker(Chunker):
+    name = "sentence"
+
+    def units(self, text, start, end) -> list:
+        """
+        Splits text into sentence units, so chunks end on sentence boundaries where possible.
+        """
+        return _sentence_units(text, start, end)
+
+class HeadingChunker(Chunker):
+    name = "heading"
+
+    def split_text(self, text) -> list:
+        """
+        Splits a page into sections at heading lines, then packs each section's sentences into chunks
+        that never span two sections. Each chunk records its section heading.
+
+        :param text: The page text.
+        :return: A list of Chunks.
+        """
+        sections = []  # (start, end, heading)
+        heading, section_start = None, 0
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            if self.is_heading(line):
+                if offset > section_start:
+                    sections.append((section_start, offset, heading))
+                heading, section_start = line.strip(), offset  # The heading stays in its section's text
+            offset += len(line)
+        sections.append((section_start, len(text), heading))
+
+        chunks = []
+        for start, end, section_heading in sections:
+            chunks.extend(self.pack(text, _sentence_units(text, start, end), section_heading))
+        return chunks
+
+    @staticmethod
+    def is_heading(line) -> bool:
+        """
+        Detects heading lines: short lines that are numbered, upper case or title case and do not end
+        like a sentence.
+
+        :param line: A line of page text.
+        :return: True if the line looks like a heading.
+        """
+        stripped = line.strip()
+        if not stripped or len(stripped) > 80 or stripped[-1] in ".,;:!?":
+            return False
+        return bool(_HEADING_PATTERN.match(stripped))
+
+CHUNKERS = {
+    TokenChunker.name: TokenChunker,
+    SentenceChunker.name: SentenceChunker,
+    HeadingChunker.name: HeadingChunker,
+}
+
+def get_chunker(strategy="sentence", chunk_size=256, chunk_overlap=32) -> Chunker:
+    """
+    Creates a chunker for a named strategy.
+
+    :param strategy: One of "token", "sentence" or "heading".
+    :param chunk_size: Maximum number of tokens per chunk.
+    :param chunk_overlap: Number of tokens repeated at the start of the next chunk.
+    :return: The configured Chunker.
+    """
+    if strategy not in CHUNKERS:
+        raise ValueError(f"Unknown chunking strategy: {strategy}. Choose from {', '.join(CHUNKERS)}.")
+    return CHUNKERS[strategy](chunk_size=chunk_size, chunk_overlap=chunk_overlap)
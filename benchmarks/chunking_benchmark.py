@@ -0,0 +1,102 @@
+import os
+import sys
+import math
+import random
+import argparse
+from collections import Counter
+
+# Adjust the path to include the root directory of the project
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Text_Chunker import CHUNKERS, get_chunker, count_tokens, _sentence_units
+
+TOPICS = ["photosynthesis", "mitosis", "enzymes", "membranes", "respiration", "genetics", "evolution", "ecology"]
+
+def synthetic_pages(num_pages, seed=0) -> list:
+    """
+    Generates textbook-like pages with numbered headings and topic-specific sentences.
+
+    :param num_pages: Number of pages to generate.
+    :param seed: Random seed.
+    :return: A list of page texts.
+    """
+    rng = random.Random(seed)
+    pages = []
+    for page in range(num_pages):
+        lines = []
+        for section in range(3):
+            topic = rng.choice(TOPICS)
+            lines.append(f"{page + 1}.{section + 1} {topic.title()}")
+            sentences = [
+                f"In {topic}, fact {rng.randint(0, 10 ** 6)} relates {rng.choice(TOPICS)} to "
+                f"{rng.choice(TOPICS)} through {rng.randint(2, 9)} stages."
+                for _ in range(rng.randint(4, 12))
+            ]
+            lines.append(" ".join(sentences))
+        pages.append("\n".join(lines))
+    return pages
+
+def pdf_pages(paths) -> list:
+    """
+    Extracts page texts from PDF files.
+
+    :param paths: Paths of the PDF files.
+    :return: A list of page texts.
+    """
+    from Document_Processor import DocumentProcessor
+    processor = DocumentProcessor()
+    return [page.page_content for page in processor.iter_pages([(path, path) for path in paths])]
+
+def retrieval_hit_rate(chunks, queries, k) -> float:
+    """
+    Measures how often a query sentence is fully contained in one of the top-k chunks returned by a
+    local TF-IDF ranking. This is a lexical stand-in for embedding retrieval, so the benchmark needs
+    no Vertex quota.
+
+    :param chunks: The chunk texts.
+    :param queries: The query sentences.
+    :param k: Number of chunks retrieved per query.
+    :return: The fraction of queries answered by a retrieved chunk.
+    """
+    tokenized = [Counter(word.lower() for word in chunk.split()) for chunk in chunks]
+    document_frequency = Counter(word for counts in tokenized for word in counts)
+    idf = {word: math.log(len(chunks) / frequency) + 1 for word, frequency in document_frequency.items()}
+    norms = [math.sqrt(sum((count * idf[word]) ** 2 for word, count in counts.items())) or 1 for counts in tokenized]
+
+    hits = 0
+    for query in queries:
+        query_counts = Counter(word.lower() for word in query.split())
+        scores = [
+            sum(count * idf.get(word, 0) ** 2 * counts.get(word, 0) for word, count in query_counts.items()) / norm
+            for counts, norm in zip(tokenized, norms)
+        ]
+        top = sorted(range(len(chunks)), key=scores.__getitem__, reverse=True)[:k]
+        hits += any(query in chunks[i] for i in top)
+    return hits / len(queries) if queries else 0.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare chunking strategies on chunk count, token cost and hit rate.")
+    parser.add_argument("pdfs", nargs="*", help="PDF files to chunk. Defaults to a synthetic corpus.")
+    parser.add_argument("--pages", type=int, default=50, help="Synthetic pages when no PDFs are given.")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=4)
+    args = parser.parse_args()
+
+    pages = pdf_pages(args.pdfs) if args.pdfs else synthetic_pages(args.pages)
+    rng = random.Random(1)
+    sentences = [page[start:end] for page in pages for start, end, _ in _sentence_units(page, 0, len(page))]
+    queries = rng.sample(sentences, min(args.queries, len(sentences)))
+    corpus_tokens = sum(count_tokens(page) for page in pages)
+
+    print(f"{len(pages)} pages, {corpus_tokens} tokens, {len(queries)} queries, top-{args.top_k}")
+    print(f"{'strategy':>9} {'size':>5} {'overlap':>7} {'chunks':>7} {'tokens':>8} {'overhead':>8} {'hit rate':>8}")
+    for strategy in CHUNKERS:
+        for chunk_size, chunk_overlap in ((128, 16), (256, 32), (512, 64)):
+            chunker = get_chunker(strategy, chunk_size, chunk_overlap)
+            chunks = [chunk.text for page in pages for chunk in chunker.split_text(page)]
+            tokens = sum(count_tokens(chunk) for chunk in chunks)
+            hit_rate = retrieval_hit_rate(chunks, queries, args.top_k)
+            print(
+                f"{strategy:>9} {chunk_size:>5} {chunk_overlap:>7} {len(chunks):>7} {tokens:>8} "
+                f"{tokens / corpus_tokens:>7.2f}x {hit_rate:>8.2%}"
+            )
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import argparse
+
+# Adjust the path to include the root directory of the project
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Embedding_Client import EmbeddingClient
+from Rate_Limiter import RateLimiter
+
+class FakeEmbeddings:
+    def __init__(self, request_latency=0.2, item_latency=0.002, dimensions=768):
+        """
+        Local stand-in for VertexAIEmbeddings with a fixed per-request and per-item latency.
+
+        :param request_latency: Seconds of latency added to every request.
+        :param item_latency: Seconds of latency added per embedded text.
+        :param dimensions: Size of the returned vectors.
+        """
+        self.request_latency = request_latency
+        self.item_latency = item_latency
+        self.dimensions = dimensions
+        self.requests = 0
+
+    def embed_documents(self, texts):
+        self.requests += 1
+        time.sleep(self.request_latency + self.item_latency * len(texts))
+        return [[float(len(text) % 7)] * self.dimensions for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+def run(num_documents, batch_size, max_workers):
+    """
+    Embeds ``num_documents`` synthetic chunks with the given batching settings.
+
+    :return: A tuple of (elapsed seconds, number of backend requests).
+    """
+    documents = [f"chunk {i} " + "lorem ipsum " * 80 for i in range(num_documents)]
+    backend = FakeEmbeddings()
+    client = EmbeddingClient(
+        "fake-embeddings", None, None,
+        rate_limiter=RateLimiter(requests_per_minute=None),
+        cache=False,
+        client=backend,
+        batch_size=batch_size,
+        max_workers=max_workers,
+    )
+    start = time.perf_counter()
+    vectors = client.embed_documents(documents)
+    elapsed = time.perf_counter() - start
+    assert len(vectors) == num_documents
+    return elapsed, backend.requests
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark EmbeddingClient batching against a fake backend.")
+    parser.add_argument("--documents", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'batch_size':>10} {'workers':>8} {'requests':>9} {'seconds':>8}")
+    for batch_size in (args.documents, 250, 100, 50):
+        for max_workers in (1, 4, 8):
+            elapsed, requests = run(args.documents, batch_size, max_workers)
+            print(f"{batch_size:>10} {max_workers:>8} {requests:>9} {elapsed:>8.2f}")
@@ -0,0 +1,80 @@
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that should import without loading any of the heavy dependencies below
+CORE_MODULES = [
+    "Quiz_Manager",
+    "Quiz_Generator",
+    "Quiz_Jobs",
+    "Question_Cache",
+    "Question_Index",
+    "Json_Stream_Parser",
+    "Keyword_Index",
+    "Document_Processor",
+    "Embedding_Client",
+    "Chroma_Collection_Creator",
+]
+HEAVY_DEPENDENCIES = [
+    "streamlit", "langchain_google_vertexai", "vertexai", "langchain", "langchain_core", "langchain_community",
+    "pypdf", "numpy",
+]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure(module):
+    """
+    Imports a module in a fresh interpreter under ``python -X importtime``.
+
+    :param module: The module to import.
+    :return: A tuple of (cumulative microseconds per imported module, heavy dependencies loaded).
+    """
+    probe = (
+        f"import {module}; import sys, json; "
+        f"print(json.dumps([name for name in {HEAVY_DEPENDENCIES!r} if name in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe], cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    # Children are reported before their parent, one level deeper, so the module's import tree is its own
+    # top-level line and the deeper lines right before it; interpreter startup imports are left out
+    entries = [match.groups() for match in map(_IMPORTTIME_LINE.match, result.stderr.splitlines()) if match]
+    end = next(i for i, (_, _, indent, name) in enumerate(entries) if name == module and len(indent) == 1)
+    start = end
+    while start > 0 and len(entries[start - 1][2]) > 1:
+        start -= 1
+    cumulative = {name: int(total) for _, total, _, name in entries[start:end + 1]}
+    return cumulative, json.loads(result.stdout.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold import time of the quiz modules.")
+    parser.add_argument("modules", nargs="*", default=CORE_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports listed per module.")
+    args = parser.parse_args()
+
+    print(f"{'module':>26} {'import ms':>10} {'heavy dependencies loaded'}")
+    heaviest = {}
+    for module in args.modules:
+        totals, loaded = [], []
+        for _ in range(args.runs):
+            cumulative, loaded = measure(module)
+            totals.append(cumulative.get(module, 0) / 1000)
+            heaviest[module] = cumulative
+        print(f"{module:>26} {statistics.median(totals):>10.1f} {', '.join(loaded) or '-'}")
+
+    if args.top:
+        for module, cumulative in heaviest.items():
+            dependencies = sorted(
+                ((name, us) for name, us in cumulative.items() if name != module), key=lambda item: -item[1]
+            )[:args.top]
+            print(f"\n{module}: " + ", ".join(f"{name} {us / 1000:.1f} ms" for name, us in dependencies))
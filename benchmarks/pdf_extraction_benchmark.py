@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import argparse
+
+# Adjust the path to include the root directory of the project
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Document_Processor import DocumentProcessor
+
+def make_pdf(num_pages, lines_per_page=40, label="") -> bytes:
+    """
+    Builds a simple text-only PDF without any PDF-writing dependency.
+
+    :param num_pages: Number of pages in the document.
+    :param lines_per_page: Number of text lines on each page.
+    :param label: Text put on every line, so generated documents differ and are not deduplicated.
+    :return: The PDF file contents.
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(num_pages):
+        lines = " ".join(
+            f"({label}Page {page} line {line}: the quick brown fox jumps over the lazy dog.) Tj T*"
+            for line in range(lines_per_page)
+        )
+        stream = f"BT /F1 10 Tf 12 TL 40 780 Td {lines} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {num_pages} >>"
+
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return output
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark DocumentProcessor PDF extraction on generated PDFs.")
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=100)
+    args = parser.parse_args()
+
+    # Unique documents, so none are deduplicated as repeated uploads
+    files = [(f"generated_{i}.pdf", make_pdf(args.pages, label=f"File {i} ")) for i in range(args.files)]
+    print(f"{args.files} files x {args.pages} pages, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'pages':>7} {'seconds':>8} {'speedup':>8}")
+
+    baseline = None
+    for max_workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        processor = DocumentProcessor(max_workers=max_workers, cache=False)  # Every run parses every page
+        start = time.perf_counter()
+        pages = processor.extract_files(files)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{max_workers:>8} {len(pages):>7} {elapsed:>8.2f} {baseline / elapsed:>7.2f}x")
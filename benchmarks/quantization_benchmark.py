@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+# Adjust the path to include the root directory of the project
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Numpy_Vector_Store import NumpyVectorStore
+
+class MatrixEmbeddings:
+    def __init__(self, vectors):
+        """
+        Local stand-in for VertexAIEmbeddings: text "i" embeds to row i of a fixed matrix.
+
+        :param vectors: The embedding matrix.
+        """
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return [self.vectors[int(text)] for text in texts]
+
+    def embed_query(self, text):
+        return self.vectors[int(text)]
+
+def make_corpus(num_chunks, dimensions, clusters=50, seed=0):
+    """
+    Builds clustered synthetic embeddings, closer to real chunk embeddings than uniform noise.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimensions))
+    assignments = rng.integers(0, clusters, num_chunks)
+    return (centers[assignments] + 0.5 * rng.standard_normal((num_chunks, dimensions))).astype(np.float32)
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+def run(vectors, queries, truth, k, quantization, keep_full_precision, rescore_factor):
+    """
+    Persists the corpus with one storage configuration and measures recall@k against exact search.
+
+    :return: A tuple of (recall, scanned bytes per vector, disk bytes, median query milliseconds).
+    """
+    directory = tempfile.mkdtemp(prefix="quantization_")
+    try:
+        embeddings = MatrixEmbeddings(vectors)
+        options = {
+            "quantization": quantization, "keep_full_precision": keep_full_precision, "rescore_factor": rescore_factor
+        }
+        store = NumpyVectorStore("benchmark", directory, embeddings, **options)
+        for offset in range(0, len(vectors), 5000):
+            texts = [str(i) for i in range(offset, min(offset + 5000, len(vectors)))]
+            store.add_texts(texts, ids=texts)
+        store.persist()
+
+        store = NumpyVectorStore("benchmark", directory, embeddings, **options)
+        latencies, hits = [], 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            found = store.batch_similarity_search_by_vector([query], k)[0]
+            latencies.append(time.perf_counter() - start)
+            hits += len({row for row, _ in found} & set(expected))
+        scanned = store._codes if store._codes is not None else store._vectors
+        bytes_per_vector = scanned.itemsize * scanned.shape[1] + (4 if store._scales is not None else 0)
+        return hits / truth.size, bytes_per_vector, directory_size(directory), np.median(latencies) * 1000
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark recall against memory for quantized embedding storage.")
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=768)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    vectors = make_corpus(args.chunks, args.dimensions)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, args.chunks, args.queries)] + 0.3 * rng.standard_normal(
+        (args.queries, args.dimensions)
+    ).astype(np.float32)
+
+    # Exact top-k as ground truth
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    truth = np.argsort(-(queries @ normalized.T), axis=1)[:, :args.k]
+
+    configurations = [
+        ("float32", None, True, 1),
+        ("float16", "float16", False, 1),
+        ("int8", "int8", False, 1),
+        ("int8+rescore", "int8", True, 4),
+    ]
+    print(f"{'storage':>13} {'recall@k':>9} {'scan B/vec':>11} {'disk MB':>8} {'query ms':>9}")
+    for name, quantization, keep_full_precision, rescore_factor in configurations:
+        recall, bytes_per_vector, disk, query_ms = run(
+            vectors, queries, truth, args.k, quantization, keep_full_precision, rescore_factor
+        )
+        print(f"{name:>13} {recall:>9.3f} {bytes_per_vector:>11} {disk / 1e6:>8.1f} {query_ms:>9.2f}")
@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+import numpy as np
+
+# Adjust the path to include the root directory of the project
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.documents import Document
+from Numpy_Vector_Store import NumpyVectorStore
+
+class RandomEmbeddings:
+    def __init__(self, dimensions=768):
+        """
+        Local stand-in for VertexAIEmbeddings returning a fixed random vector per text, with no latency,
+        so the benchmark measures the vector store only.
+
+        :param dimensions: Size of the returned vectors.
+        """
+        self.dimensions = dimensions
+
+    def embed_query(self, text):
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(self.dimensions).astype(np.float32).tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+def open_store(backend, directory, embeddings):
+    """
+    Opens the benchmark collection with the given backend.
+    """
+    if backend == "numpy":
+        return NumpyVectorStore("benchmark", directory, embeddings)
+    from langchain_community.vectorstores import Chroma
+    return Chroma(collection_name="benchmark", persist_directory=directory, embedding_function=embeddings)
+
+def run(backend, num_chunks, num_queries, dimensions):
+    """
+    Builds a collection of ``num_chunks`` synthetic chunks, then measures a cold load (open plus first
+    query) and the latency of ``num_queries`` top-4 queries.
+
+    :return: A tuple of (build seconds, cold load seconds, median query milliseconds).
+    """
+    directory = tempfile.mkdtemp(prefix=f"{backend}_store_")
+    embeddings = RandomEmbeddings(dimensions)
+    documents = [Document(page_content=f"chunk {i}", metadata={"document_id": str(i % 10)}) for i in range(num_chunks)]
+    try:
+        start = time.perf_counter()
+        store = open_store(backend, directory, embeddings)
+        for offset in range(0, num_chunks, 1000):
+            batch = documents[offset:offset + 1000]
+            store.add_documents(batch, ids=[f"id{offset + i}" for i in range(len(batch))])
+        if hasattr(store, "persist"):
+            store.persist()
+        build = time.perf_counter() - start
+        del store
+
+        start = time.perf_counter()
+        store = open_store(backend, directory, embeddings)
+        store.similarity_search_with_relevance_scores("chunk 0", k=4)
+        cold_load = time.perf_counter() - start
+
+        latencies = []
+        for i in range(num_queries):
+            start = time.perf_counter()
+            store.similarity_search_with_relevance_scores(f"query {i}", k=4)
+            latencies.append(time.perf_counter() - start)
+        return build, cold_load, statistics.median(latencies) * 1000
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy vector store against Chroma.")
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=768)
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} {'build s':>8} {'cold load s':>12} {'query ms':>9}")
+    for backend in ("numpy", "chroma"):
+        try:
+            build, cold_load, query_ms = run(backend, args.chunks, args.queries, args.dimensions)
+        except ImportError as e:
+            print(f"{backend:>8} skipped: {e}")
+            continue
+        print(f"{backend:>8} {build:>8.2f} {cold_load:>12.3f} {query_ms:>9.2f}")
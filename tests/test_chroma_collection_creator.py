@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("numpy")
+lc_documents = pytest.importorskip("langchain_core.documents")
+
+from Chroma_Collection_Creator import ChromaCollectionCreator
+from Document_Processor import DocumentProcessor
+
+class LetterEmbeddings:
+    """
+    Embeds a text as its letter counts, which is enough to tell the test documents apart.
+    """
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [text.lower().count(letter) + 0.01 for letter in "abcdefghijklmnopqrstuvwxyz"]
+
+def make_processor(*document_ids):
+    processor = DocumentProcessor(cache=False)
+    processor.pages = [
+        lc_documents.Document(
+            page_content=f"Pages of document {document_id} about {document_id} things.",
+            metadata={"source": f"{document_id}.pdf", "page": 0, "document_id": document_id}
+        )
+        for document_id in document_ids
+    ]
+    processor.document_ids = list(document_ids)
+    return processor
+
+def indexed_documents(creator):
+    metadatas = creator.db.get(include=["metadatas"])["metadatas"]
+    return {metadata["document_id"] for metadata in metadatas}
+
+def test_removed_document_is_not_in_the_smaller_sets_collection(tmp_path):
+    embeddings = LetterEmbeddings()
+    options = {"persist_directory": str(tmp_path), "backend": "numpy", "notify": lambda level, message: None}
+
+    both = ChromaCollectionCreator(make_processor("alpha", "beta"), embeddings, **options)
+    both.create_chroma_collection()
+    alpha = ChromaCollectionCreator(make_processor("alpha"), embeddings, **options)
+    alpha.create_chroma_collection()
+
+    assert alpha.db_collection_name != both.db_collection_name
+    assert indexed_documents(alpha) == {"alpha"}
+    assert all(document.metadata["document_id"] == "alpha" for document, _ in alpha.search("beta", mode="keyword"))
+    assert indexed_documents(both) == {"alpha", "beta"}
@@ -0,0 +1,66 @@
+import Document_Processor
+from Document_Processor import DocumentProcessor, PageCache
+
+def test_iter_pages_records_document_ids_before_extraction(tmp_path, make_pdf):
+    path = tmp_path / "book.pdf"
+    path.write_bytes(make_pdf(3))
+    processor = DocumentProcessor(cache=False)
+
+    pages = processor.iter_pages([("book.pdf", str(path))])
+    assert processor.document_ids == [DocumentProcessor.hash_document(str(path))]
+    assert processor.fingerprint() is not None
+
+    pages = list(pages)
+    assert len(pages) == 3
+    assert {page.metadata["document_id"] for page in pages} == set(processor.document_ids)
+
+def test_iter_pages_keeps_duplicate_files_once(make_pdf):
+    pdf = make_pdf(2)
+    processor = DocumentProcessor(cache=False)
+    pages = list(processor.iter_pages([("a.pdf", pdf), ("b.pdf", pdf)]))
+    assert len(pages) == 2
+    assert len(processor.document_ids) == 1
+
+def test_extract_files_on_worker_processes_keeps_upload_order(make_pdf):
+    files = [(f"{i}.pdf", make_pdf(2, lines_per_page=2, label=f"File {i} ")) for i in range(3)]
+    cache = PageCache()
+    processor = DocumentProcessor(max_workers=2, cache=cache)
+    pages = processor.extract_files(files + files[:1])
+    assert [(page.metadata["source"], page.metadata["page"]) for page in pages] == [
+        (name, page) for name, _ in files for page in range(2)
+    ]
+    assert pages[0].page_content.startswith("File 0 Page 0")
+    assert all(cache.get(document_id) for document_id in processor.document_ids)
+
+class FakeUpload:
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+
+    def getvalue(self):
+        return self.data
+
+class FakeStreamlit:
+    def __init__(self, uploads):
+        self.uploads = uploads
+        self.messages = []
+
+    def file_uploader(self, label, type=None, accept_multiple_files=False):
+        return self.uploads
+
+    def write(self, message):
+        self.messages.append(message)
+
+def test_streamed_ingestion_defers_extraction(monkeypatch, make_pdf):
+    uploads = [FakeUpload("a.pdf", make_pdf(2, label="A ")), FakeUpload("b.pdf", make_pdf(1, label="B "))]
+    monkeypatch.setattr(Document_Processor, "st", FakeStreamlit(uploads))
+    processor = DocumentProcessor(cache=False)
+
+    processor.ingest_documents(stream=True)
+    assert processor.pages == []
+    assert len(processor.document_ids) == 2
+    fingerprint = processor.fingerprint()
+
+    pages = list(processor.iter_pages(processor.files))
+    assert [page.metadata["source"] for page in pages] == ["a.pdf", "a.pdf", "b.pdf"]
+    assert processor.fingerprint() == fingerprint
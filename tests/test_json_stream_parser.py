@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from Json_Stream_Parser import IncrementalJSONParser, MalformedStreamError
+
+QUESTION = {
+    "question": "What does \"MMR\" stand for?\nPick one: café \\ path",
+    "choices": [{"key": "A", "value": "Maximal marginal relevance"}, {"key": "B", "value": "[not {this}]"}],
+    "answer": "A",
+    "explanation": "Emoji \U0001F600 and unicode é survive.",
+    "score": -1.5e3,
+    "flags": {"nested": [True, False, None]},
+}
+
+def feed_in_chunks(text, size, **kwargs):
+    parser = IncrementalJSONParser(**kwargs)
+    for start in range(0, len(text), size):
+        parser.feed(text[start:start + size])
+    return parser
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_object_root_at_any_chunk_boundary(size):
+    text = json.dumps(QUESTION)
+    parser = feed_in_chunks(text, size)
+    assert parser.complete
+    assert parser.result() == QUESTION
+    assert parser.items == [QUESTION]
+
+@pytest.mark.parametrize("size", [1, 5, 1000])
+def test_list_root_with_fence_and_ascii_escapes(size):
+    text = "```json\n" + json.dumps([QUESTION, {"question": "second"}], indent=2) + "\n```"
+    parser = feed_in_chunks(text, size)
+    assert parser.result() == [QUESTION, {"question": "second"}]
+    assert parser.items == [QUESTION, {"question": "second"}]
+
+def test_fields_available_as_soon_as_complete():
+    parser = IncrementalJSONParser()
+    parser.feed('{"question": "Why?", "choices": [{"key": "A"')
+    assert parser.fields == {"question": "Why?"}
+    parser.feed('}], "answer"')
+    assert parser.fields == {"question": "Why?", "choices": [{"key": "A"}]}
+
+def test_snapshot_decodes_partial_string_and_trims_partial_escapes():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"question": "caf\\u00') == {"question": "caf"}
+    assert parser.feed('e9 \\') == {"question": "café "}
+    assert parser.feed('"quoted') == {"question": "café \"quoted"}
+
+def test_allowed_keys_abort_on_unknown_field():
+    parser = IncrementalJSONParser(allowed_keys=["question"])
+    with pytest.raises(MalformedStreamError):
+        parser.feed('{"question": "x", "prose": ')
+
+@pytest.mark.parametrize("text", [
+    '{"a": 1,, "b": 2}',
+    '{, "a": 1}',
+    '{"a": 1,}',
+    '{"a": ,"b": 1}',
+    '{"a": }',
+    '{"a" "b"}',
+    '{"a": 1 "b": 2}',
+    '{"a": 1]',
+    '[{"a": 1},, {"b": 2}]',
+    '[{"a": 1},]',
+    '[{"a": 1} {"b": 2}]',
+    '[, {"a": 1}]',
+    '[1, 2]',
+    '{"a": tru e}',
+    '{"a": @}',
+])
+def test_malformed_streams_abort_before_the_end(text):
+    parser = IncrementalJSONParser()
+    with pytest.raises(MalformedStreamError):
+        parser.feed(text)
+
+def test_result_of_incomplete_stream_raises():
+    parser = IncrementalJSONParser()
+    parser.feed('{"question": "x"')
+    with pytest.raises(MalformedStreamError):
+        parser.result()
+
+def test_invalid_nested_value_aborts_when_it_closes():
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": {"b" 1')
+    with pytest.raises(MalformedStreamError):
+        parser.feed('}')
+
+def test_missing_json_within_preamble_limit():
+    parser = IncrementalJSONParser(max_preamble=10)
+    with pytest.raises(MalformedStreamError):
+        parser.feed("Sure! Here is your quiz question about the topic:")
+
+def test_empty_containers():
+    assert feed_in_chunks("{}", 1).result() == {}
+    assert feed_in_chunks("[]", 1).result() == []
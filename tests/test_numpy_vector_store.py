@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from Numpy_Vector_Store import NumpyVectorStore
+
+class MatrixEmbeddings:
+    """
+    Text "i" embeds to row i of a fixed matrix; any other text is looked up in ``queries``.
+    """
+    def __init__(self, vectors, queries=None):
+        self.vectors = vectors
+        self.queries = queries or {}
+
+    def embed_documents(self, texts):
+        return [self.vectors[int(text)] for text in texts]
+
+    def embed_query(self, text):
+        return self.queries[text] if text in self.queries else self.vectors[int(text)]
+
+def exact_top_k(vectors, query, k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    return [str(row) for row in np.argsort(-scores)[:k]]
+
+def make_store(tmp_path, vectors, queries=None, persisted=None, **options):
+    embeddings = MatrixEmbeddings(vectors, queries)
+    store = NumpyVectorStore("test", str(tmp_path), embeddings, **options)
+    texts = [str(i) for i in range(len(vectors))]
+    split = len(texts) if persisted is None else persisted
+    store.add_texts(texts[:split], ids=texts[:split])
+    if persisted is not None:
+        store.persist()
+        store.add_texts(texts[split:], ids=texts[split:])  # Left pending, in memory
+    return store
+
+def test_mmr_starts_with_most_relevant_entry(tmp_path):
+    vectors = np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.9, 0.1, 0.0]], dtype=np.float32)
+    store = make_store(tmp_path, vectors, {"query": np.array([1.0, 0.0, 0.0])})
+    results = store.max_marginal_relevance_search("query", k=2, fetch_k=3)
+    assert results[0].page_content == "1"
+
+@pytest.mark.parametrize("quantization", [None, "int8"])
+def test_mmr_without_diversity_matches_exact_search(tmp_path, quantization):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((200, 16)).astype(np.float32)
+    store = make_store(tmp_path, vectors, persisted=150, quantization=quantization)
+    for query_row in rng.integers(0, len(vectors), 10):
+        query = str(query_row)
+        expected = exact_top_k(vectors, vectors[query_row], 5)
+        results = store.max_marginal_relevance_search(query, k=5, fetch_k=20, lambda_mult=1.0)
+        assert [document.page_content for document in results] == expected
+
+def test_mmr_first_result_matches_exact_search(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((100, 8)).astype(np.float32)
+    store = make_store(tmp_path, vectors, persisted=60)
+    for query_row in rng.integers(0, len(vectors), 10):
+        results = store.max_marginal_relevance_search(str(query_row), k=4, fetch_k=20, lambda_mult=0.3)
+        assert results[0].page_content == exact_top_k(vectors, vectors[query_row], 1)[0]
+        assert len({document.page_content for document in results}) == 4
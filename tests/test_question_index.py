@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from Question_Index import QuestionSimilarityIndex
+
+class CountingEmbeddings:
+    """
+    Embeds a text as its letter counts and counts the embedding calls.
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [text.lower().count(letter) + 0.01 for letter in "abcdefghijklmnopqrstuvwxyz"]
+
+def test_rejected_questions_are_not_kept():
+    index = QuestionSimilarityIndex(CountingEmbeddings(), threshold=0.9)
+    index.add("What is the capital of France?")
+    for i in range(100):
+        rephrased = f"What is the capital of Fr{'a' * (i % 3 + 1)}nce, number {i}?"
+        assert index.is_duplicate(rephrased)
+        assert index._last_checked[0] == rephrased  # Only the last checked question is held
+    assert len(index) == 1
+
+    index.add("Which river flows through Paris?")
+    assert index._last_checked is None
+
+def test_accepted_question_reuses_its_checked_embedding():
+    embeddings = CountingEmbeddings()
+    index = QuestionSimilarityIndex(embeddings, threshold=0.99)
+    index.add("What is the capital of France?")
+    question = "Which river flows through Paris?"
+    assert not index.is_duplicate(question)
+    calls = embeddings.calls
+    index.add(question)
+    assert embeddings.calls == calls
+    assert index.is_duplicate("Which river flows through Paris")
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("langchain.output_parsers")  # QuizGenerator builds its output parsers on init
+
+import Context_Planner
+import Quiz_Generator
+from Quiz_Generator import QuizGenerator
+from Rate_Limiter import RateLimiter
+
+class Chunk:
+    def __init__(self, page_content):
+        self.page_content = page_content
+
+class FakeDB:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.searches = 0
+
+    def similarity_search(self, query, k=4):
+        self.searches += 1
+        time.sleep(self.delay)
+        return [Chunk(f"chunk {i}") for i in range(k)]
+
+    def max_marginal_relevance_search(self, query, k=4, fetch_k=20, lambda_mult=0.5):
+        return self.similarity_search(query, k)
+
+class FakeVectorstore:
+    def __init__(self, db=None):
+        self.db = db or FakeDB()
+
+class FakeChain:
+    """
+    Stands in for the prompt | llm | parser chain. Each call returns the next question from ``questions``
+    (numbered questions once they run out) after ``delay`` seconds, or blocks until ``release`` is set when
+    ``hang`` is true. A call listed in ``errors`` raises that exception instead.
+    """
+    def __init__(self, questions=(), delay=0.0, hang=False, errors=None):
+        self.questions = list(questions)
+        self.delay = delay
+        self.hang = hang
+        self.errors = dict(errors or {})
+        self.release = threading.Event()
+        self.calls = 0
+        self.contexts = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, inputs):
+        with self._lock:
+            call = self.calls
+            self.calls += 1
+            self.contexts.append(inputs["context"])
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if call in self.errors:
+                raise self.errors[call]
+            if self.hang:
+                self.release.wait(10)
+            time.sleep(self.delay)
+            text = self.questions[call] if call < len(self.questions) else f"Question {call}?"
+            return {"question": text, "choices": [], "answer": "A", "explanation": ""}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+class FakeService:
+    model_name = "fake"
+
+    def __init__(self, chain):
+        self.chain = chain
+
+    def get_llm(self, max_output_tokens):
+        return None
+
+    def get_chain(self, generator, kind):
+        return self.chain
+
+def make_generator(chain, num_questions, vectorstore=None, **options):
+    options.setdefault("rate_limiter", RateLimiter(requests_per_minute=None))
+    return QuizGenerator(
+        "Topic", num_questions, vectorstore or FakeVectorstore(), service=FakeService(chain), question_cache=False,
+        **options
+    )
+
+def test_requests_run_concurrently():
+    chain = FakeChain(delay=0.2)
+    generator = make_generator(chain, 4, max_workers=4)
+    started = time.monotonic()
+    questions, _ = generator.generate_quiz()
+    assert len(questions) == 4
+    assert chain.max_active == 4
+    assert time.monotonic() - started < 0.6
+
+def test_duplicates_are_rejected_and_replaced():
+    chain = FakeChain(["What is X?", "what is x", "What is Y?"])
+    generator = make_generator(chain, 2, max_workers=1)
+    questions, raw = generator.generate_quiz()
+    assert [question["question"] for question in questions] == ["What is X?", "What is Y?"]
+    assert len(raw) == 3
+
+def test_hung_requests_return_a_partial_quiz():
+    chain = FakeChain(hang=True)
+    generator = make_generator(chain, 3, max_workers=2, request_timeout=0.2)
+    try:
+        started = time.monotonic()
+        questions, _ = generator.generate_quiz()
+        assert questions == []
+        assert time.monotonic() - started < 2
+        assert chain.calls == 4  # Two rounds on the spare threads, then the quiz gives up
+    finally:
+        chain.release.set()
+
+def test_time_waiting_for_quota_is_not_timed():
+    # One request per 0.2s; each call returns at once but the last waits 0.4s for the limiter
+    limiter = RateLimiter(requests_per_minute=300)
+    limiter.acquire(requests=300)
+    chain = FakeChain()
+    generator = make_generator(chain, 3, max_workers=3, request_timeout=0.1, rate_limiter=limiter)
+    questions, _ = generator.generate_quiz()
+    assert len(questions) == 3
+    assert chain.calls == 3  # No request timed out while queued and was sent anyway
+
+def test_quota_errors_are_retried_after_backoff():
+    limiter = RateLimiter(requests_per_minute=None, base_delay=0.01)
+    chain = FakeChain(errors={0: RuntimeError("429 Too Many Requests")})
+    generator = make_generator(chain, 1, rate_limiter=limiter)
+    questions, _ = generator.generate_quiz()
+    assert len(questions) == 1
+    assert limiter.stats()["quota_errors"] == 1
+    assert chain.calls == 2
+
+def test_workers_share_one_context_retrieval(monkeypatch):
+    planners = []
+
+    class SlowPlanner(Context_Planner.ContextPlanner):
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.05)  # Widens the window in which workers could each build a planner
+            super().__init__(*args, **kwargs)
+            planners.append(self)
+
+    monkeypatch.setattr(Quiz_Generator, "ContextPlanner", SlowPlanner)
+    db = FakeDB(delay=0.1)
+    chain = FakeChain()
+    generator = make_generator(chain, 4, FakeVectorstore(db), max_workers=4, context_pool_size=16)
+    questions, _ = generator.generate_quiz()
+    assert len(questions) == 4
+    assert len(planners) == db.searches == 1
+    chunks = [chunk for context in chain.contexts for chunk in context.split("\n\n")]
+    assert len(chunks) == len(set(chunks)) == 16  # Each request got its own slice
@@ -0,0 +1,52 @@
+import threading
+
+from Quiz_Jobs import QuizJob, QuizJobQueue
+
+class FakeService:
+    """
+    Generates one question per quiz. A quiz on the topic "block" waits until ``release`` is set, so tests
+    can hold the workers while they queue more jobs.
+    """
+    def __init__(self):
+        self.release = threading.Event()
+        self.order = []
+        self.options = []
+
+    def generate_quiz(self, topic, num_questions, vectorstore, on_question=None, stop_event=None, **options):
+        if topic == "block":
+            self.release.wait(5)
+        self.order.append(topic)
+        self.options.append(options)
+        question = {"question": f"{topic}?"}
+        on_question(question)
+        return [question], []
+
+def wait_all(jobs):
+    for job in jobs:
+        job.wait_for(1, timeout=5)
+        assert job.status == QuizJob.DONE
+
+def test_jobs_with_different_options_are_not_shared():
+    queue = QuizJobQueue(FakeService())
+    vectorstore = object()
+    first = queue.submit("Topic", 3, vectorstore, batch_size=2)
+    assert queue.submit("topic ", 3, vectorstore, batch_size=2) is first
+    other = queue.submit("Topic", 3, vectorstore, batch_size=1)
+    assert other is not first
+    wait_all([first, other])
+    assert sorted(options["batch_size"] for options in queue.service.options) == [1, 2]
+
+def test_submitted_jobs_run_before_speculative_ones():
+    service = FakeService()
+    queue = QuizJobQueue(service, num_workers=1)
+    vectorstore = object()
+    blocker = queue.submit("block", 1, vectorstore)
+    first = queue.submit("first", 1, vectorstore, speculative=True)
+    second = queue.submit("second", 1, vectorstore, speculative=True)
+    submitted = queue.submit("submitted", 1, vectorstore)
+    assert queue.promote(second)
+    assert queue.submit("first", 1, vectorstore, speculative=True) is first  # Stays at low priority
+
+    service.release.set()
+    wait_all([blocker, first, second, submitted])
+    assert service.order == ["block", "submitted", "second", "first"]
@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+from Text_Chunker import HeadingChunker, SentenceChunker, TokenChunker, count_tokens
+
+TEXT = (
+    "Contents " + "." * 80 + " 12. See https://example.com/a/b/c/d/e/f/g/h/i/j/k/l/m/n/o/p/q?x=1&y=2 "
+    "for more. Short sentence here."
+)
+
+@pytest.mark.parametrize("chunker", [SentenceChunker(16, 4), TokenChunker(16, 4), HeadingChunker(16, 4)])
+def test_words_without_spaces_are_split_within_the_budget(chunker):
+    chunks = chunker.split_text(TEXT)
+    assert max(count_tokens(chunk.text) for chunk in chunks) <= 16
+    assert all(TEXT[chunk.start:chunk.end] == chunk.text for chunk in chunks)
+    assert "".join(chunk.text for chunk in chunks).count(".") >= 80  # No text is dropped
+
+@pytest.mark.parametrize("line", [
+    "A" * 35 + "a b",
+    "SELECTFROMWHEREGROUPBYHAVINGORDERBYLIMIT x",
+    "ACGT" * 18 + "acg x",
+    "Aa " * 26 + "x",
+])
+def test_heading_detection_does_not_backtrack(line):
+    started = time.perf_counter()
+    assert not HeadingChunker.is_heading(line)
+    assert time.perf_counter() - started < 0.05
+
+@pytest.mark.parametrize("line", ["Introduction", "Methods And Results", "2.1 Data sources", "SUMMARY OF FINDINGS"])
+def test_headings_are_detected(line):
+    assert HeadingChunker.is_heading(line)